@@ -4,8 +4,18 @@ CR-V4 Core Algorithms Package
 Contains the mathematical foundation of the AI engine:
 - bayesian_learning: Mastery estimation using Bayes theorem
 - irt_model: Item Response Theory 3PL model
+- irt_tables: Tabulated ICC / Fisher information for hot-path scoring
 - knowledge_state: 3 time-scale knowledge tracking (SAINT-equivalent)
+- columnar_state: Struct-of-arrays knowledge state backend (low memory)
+- state_replay: Bulk rebuild of knowledge states from attempt logs
+- review_scheduler: Platform-wide queue of due spaced repetition reviews
 - question_selector: Multi-criteria question selection
+- question_registry: Indexed live question bank shared by selectors
+- question_columns: Columnar (struct-of-arrays) bank for vectorized scoring
+- prerequisite_eligibility: Incremental per-student prerequisite bitmaps
+- state_codec: Versioned compact binary codec for student knowledge state
+- mapped_bank: Read-only memory-mapped question bank shared across workers
+- item_calibration: Bulk marginal-MLE (EM) and online recalibration of the bank
 - misconception_detector: Severity-based misconception detection
 - student_profiles: Student classification and dynamic weights
 - diagnostic_engine: Cold-start assessment
@@ -26,14 +36,20 @@ from .irt_model import (
     irt_probability,
     fisher_information,
     estimate_ability,
+    estimate_ability_batch,
+    eap_log_likelihood,
+    pad_responses,
     ability_to_mastery,
     mastery_to_ability,
     calculate_selection_score,
     calibrate_question,
+    fit_item_parameters,
     get_subject_c,
     SUBJECT_C_VALUES
 )
 
+from .irt_tables import ResponseTables, DEFAULT_TABLE_ERROR
+
 from .knowledge_state import (
     StudentKnowledgeState,
     ConceptState,
@@ -45,6 +61,10 @@ from .knowledge_state import (
     RETENTION_FLOOR
 )
 
+from .columnar_state import ColumnarKnowledgeState, state_memory_bytes
+from .state_replay import read_attempt_log, replay_student, replay_log
+from .review_scheduler import ReviewScheduler
+
 from .question_selector import (
     Question,
     SelectionResult,
@@ -58,6 +78,34 @@ from .question_selector import (
     SUBJECT_STRATEGIES
 )
 
+from .question_registry import QuestionRegistry
+from .question_columns import QuestionColumns, top_k_rows
+from .prerequisite_eligibility import PrerequisiteEligibility
+
+from .mapped_bank import (
+    compile_question_bank,
+    MappedQuestionRegistry,
+    MappedQuestionColumns,
+    ReadOnlyBankError,
+    BankFileError
+)
+
+from .state_codec import (
+    encode_state,
+    decode_state,
+    StateCodecError,
+    STATE_CODEC_VERSION
+)
+
+from .item_calibration import (
+    ResponseLog,
+    CalibrationResult,
+    collect_responses,
+    calibrate_items,
+    calibrate_bank,
+    OnlineItemCalibrator
+)
+
 from .misconception_detector import (
     Misconception,
     MisconceptionSeverity,
@@ -193,12 +241,18 @@ __all__ = [
     'irt_probability',
     'fisher_information',
     'estimate_ability',
+    'estimate_ability_batch',
+    'eap_log_likelihood',
+    'pad_responses',
     'ability_to_mastery',
     'mastery_to_ability',
     'calculate_selection_score',
     'calibrate_question',
+    'fit_item_parameters',
     'get_subject_c',
     'SUBJECT_C_VALUES',
+    'ResponseTables',
+    'DEFAULT_TABLE_ERROR',
     
     # Knowledge State
     'StudentKnowledgeState',
@@ -209,6 +263,12 @@ __all__ = [
     'process_interaction',
     'SUBJECT_TIME_WEIGHTS',
     'RETENTION_FLOOR',
+    'ColumnarKnowledgeState',
+    'state_memory_bytes',
+    'read_attempt_log',
+    'replay_student',
+    'replay_log',
+    'ReviewScheduler',
     
     # Question Selection
     'Question',
@@ -221,6 +281,31 @@ __all__ = [
     'SyllabusStatus',
     'CompetencyType',
     'SUBJECT_STRATEGIES',
+    'QuestionRegistry',
+    'QuestionColumns',
+    'top_k_rows',
+    'PrerequisiteEligibility',
+    
+    # Mapped Question Bank
+    'compile_question_bank',
+    'MappedQuestionRegistry',
+    'MappedQuestionColumns',
+    'ReadOnlyBankError',
+    'BankFileError',
+    
+    # State Codec
+    'encode_state',
+    'decode_state',
+    'StateCodecError',
+    'STATE_CODEC_VERSION',
+    
+    # Item Calibration
+    'ResponseLog',
+    'CalibrationResult',
+    'collect_responses',
+    'calibrate_items',
+    'calibrate_bank',
+    'OnlineItemCalibrator',
     
     # Misconception
     'Misconception',
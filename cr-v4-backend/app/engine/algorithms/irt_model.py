@@ -22,7 +22,7 @@ Reference: Lord & Novick (1968), Baker & Kim (2017)
 
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from enum import Enum
 import math
 from functools import lru_cache
@@ -102,6 +102,15 @@ MAX_ITERATIONS = 1000
 CONVERGENCE_THRESHOLD = 1e-6
 MIN_SAMPLE_SIZE = 30  # Minimum responses for calibration
 
+# EAP quadrature (fixed grid over the ability range, step 0.1)
+EAP_GRID_POINTS = 81
+EAP_GRID = np.linspace(ABILITY_MIN, ABILITY_MAX, EAP_GRID_POINTS)
+EAP_LOG_PRIOR = -0.5 * EAP_GRID ** 2  # Standard normal, same prior as MAP
+
+# Beta(alpha, beta) prior on the guessing parameter for Bayesian
+# calibration (mean 0.25, the 4-option MCQ default)
+C_PRIOR = (5.0, 15.0)
+
 # ============================================================================
 # DATA STRUCTURES
 # ============================================================================
@@ -236,7 +245,16 @@ def irt_probability(
         
         >>> irt_probability(-1.0, 1.5, 1.0, 0.25)  # Weak student, hard question
         0.35   # Low probability, mostly guessing
+    
+    Python float / int arguments take a pure-math path (same formula,
+    same clipping, same np.float64 result type); any array goes through
+    NumPy. The two agree to rounding, not bit for bit: math.exp and
+    NumPy's vectorized exp differ in the last ulp for ~1% of inputs, so
+    compare scalar and array results with a relative tolerance.
     """
+    if _all_scalars(ability, a, b, c):
+        return np.float64(_scalar_probability(ability, a, b, c))
+    
     # Convert to numpy arrays for vectorized operations
     a = np.asarray(a)
     b = np.asarray(b)
@@ -330,7 +348,16 @@ def fisher_information(
         
         >>> fisher_information(2.0, 1.5, 0.0, 0.25)  # Mismatch: easy for student
         0.05  # Low information - too easy
+    
+    Scalar arguments take the same pure-math path as irt_probability
+    (equal to the array result to rounding, not bit for bit).
     """
+    if _all_scalars(ability, a, b, c):
+        P = _scalar_probability(ability, a, b, c)
+        logistic = 1 / (1 + math.exp(-_clip(a * (ability - b), -700, 700)))
+        dP_dtheta = a * (1 - c) * logistic * (1 - logistic)
+        return np.float64((dP_dtheta ** 2) / (P * (1 - P)))
+    
     # Convert to numpy arrays for vectorized operations
     a = np.asarray(a)
     b = np.asarray(b)
@@ -355,6 +382,28 @@ def fisher_information(
     return information
 
 
+def _all_scalars(*values) -> bool:
+    """True if every argument is a plain Python (or NumPy float64) number"""
+    for value in values:
+        if not isinstance(value, (float, int)):
+            return False
+    return True
+
+
+def _clip(value: float, low: float, high: float) -> float:
+    """np.clip for one float"""
+    return low if value < low else high if value > high else value
+
+
+def _scalar_probability(ability: float, a: float, b: float, c: float) -> float:
+    """irt_probability for Python floats (math.exp, no array round-trips)"""
+    a = _clip(a, IRT_A_MIN, IRT_A_MAX)
+    b = _clip(b, IRT_B_MIN, IRT_B_MAX)
+    c = _clip(c, IRT_C_MIN, IRT_C_MAX)
+    logit = _clip(a * (ability - b), -700, 700)
+    return _clip(c + (1 - c) / (1 + math.exp(-logit)), 0.0001, 0.9999)
+
+
 def maximum_information_ability(a: float, b: float, c: float) -> float:
     """
     Find the ability level where Fisher Information is maximized.
@@ -395,7 +444,7 @@ def estimate_ability(
     Methods:
     - "mle": Maximum Likelihood Estimation (no prior)
     - "map": Maximum A Posteriori (with normal prior, recommended)
-    - "eap": Expected A Posteriori (Bayesian integration)
+    - "eap": Expected A Posteriori (quadrature over EAP_GRID)
     
     Args:
         responses: List of correct (True) / incorrect (False)
@@ -408,7 +457,8 @@ def estimate_ability(
         
     Implementation:
     Uses Newton-Raphson iteration for MLE/MAP with Fisher Information
-    for standard error calculation.
+    for standard error calculation. EAP is the posterior mean on the
+    quadrature grid, with the posterior SD as standard error.
     """
     if len(responses) == 0 or len(responses) != len(parameters):
         return prior_ability, 1.0  # High uncertainty
@@ -420,6 +470,14 @@ def estimate_ability(
     b_arr = np.array([p.b for p in parameters])
     c_arr = np.array([p.c for p in parameters])
     
+    if method == "eap":
+        log_p, log_q = eap_log_likelihood(a_arr, b_arr, c_arr)
+        log_posterior = EAP_LOG_PRIOR + np.where(
+            responses_arr[:, None] > 0.5, log_p, log_q
+        ).sum(axis=0)
+        mean, sd = eap_moments(log_posterior)
+        return float(mean), float(sd)
+    
     # Initialize
     theta = prior_ability
     
@@ -476,6 +534,241 @@ def estimate_ability(
     return theta, standard_error
 
 
+def eap_log_likelihood(
+    a: Union[float, np.ndarray],
+    b: Union[float, np.ndarray],
+    c: Union[float, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-item log-likelihood vectors on the EAP quadrature grid.
+    
+    Returns:
+        (log P, log(1-P)), shaped (..., EAP_GRID_POINTS) for array
+        parameters; a response adds one of them to a log posterior
+    """
+    a, b, c = (np.asarray(x, dtype=float)[..., None] for x in (a, b, c))
+    P = irt_probability(EAP_GRID, a, b, c)
+    return np.log(P), np.log1p(-P)
+
+
+def eap_moments(log_posterior: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Posterior mean and SD from unnormalized log posteriors on the grid.
+    
+    Works on a single vector or on (..., EAP_GRID_POINTS) stacks.
+    """
+    weights = np.exp(log_posterior - log_posterior.max(axis=-1, keepdims=True))
+    weights /= weights.sum(axis=-1, keepdims=True)
+    mean = weights @ EAP_GRID
+    variance = weights @ (EAP_GRID ** 2) - mean ** 2
+    return mean, np.sqrt(np.maximum(variance, 0.0))
+
+
+def pad_responses(
+    responses: Sequence[Sequence[bool]],
+    parameters: Sequence[Sequence[IRTParameters]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pack ragged per-student response lists into padded 2-D arrays.
+    
+    Args:
+        responses: One response list per student
+        parameters: Matching IRTParameters lists
+        
+    Returns:
+        (responses, a, b, c), each shaped (students, longest list);
+        unanswered slots are NaN in responses
+    """
+    if len(responses) != len(parameters):
+        raise ValueError("Need one parameter list per student")
+    
+    width = max((len(r) for r in responses), default=0)
+    shape = (len(responses), width)
+    packed = np.full(shape, np.nan)
+    a = np.full(shape, IRT_A_DEFAULT)
+    b = np.full(shape, IRT_B_DEFAULT)
+    c = np.full(shape, IRT_C_DEFAULT)
+    
+    for row, (student_responses, student_params) in enumerate(zip(responses, parameters)):
+        n = len(student_responses)
+        if n == 0 or n != len(student_params):
+            continue  # estimate_ability treats a mismatch as no data
+        packed[row, :n] = student_responses
+        a[row, :n] = [p.a for p in student_params]
+        b[row, :n] = [p.b for p in student_params]
+        c[row, :n] = [p.c for p in student_params]
+    
+    return packed, a, b, c
+
+
+def estimate_ability_batch(
+    responses: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray,
+    prior_ability: Union[float, np.ndarray] = 0.0,
+    method: str = "map"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimate many students' abilities at once.
+    
+    Runs the same damped Newton-Raphson as estimate_ability, but for all
+    students in lock-step over a 2-D array: one NumPy pass per iteration
+    instead of one Python loop per student. Students that converge are
+    dropped from the working set, so late iterations only touch the
+    stragglers. EAP needs no iteration: the log posteriors of all
+    students are accumulated on the quadrature grid in one pass.
+    
+    Args:
+        responses: (students, items) array of 1/0 responses, NaN where a
+                   student has no response (see pad_responses for ragged
+                   input)
+        a, b, c: IRT parameters broadcastable to responses, e.g. (items,)
+                 for a shared bank or (students, items) when padded
+        prior_ability: Starting ability, scalar or per student
+        method: "mle", "map" or "eap" (as in estimate_ability)
+        
+    Returns:
+        (abilities, standard_errors), each shaped (students,); students
+        without responses get (prior_ability, 1.0)
+    """
+    responses = np.atleast_2d(np.asarray(responses, dtype=float))
+    observed = ~np.isnan(responses)
+    a, b, c = (np.asarray(x, dtype=float) for x in (a, b, c))
+    
+    # Sparse matrices (e.g. students x whole bank): pack each student's
+    # answered items to the left so every pass works on ~answers, not items
+    # (EAP over a shared bank is two matrix products, no need)
+    counts = observed.sum(axis=1)
+    width = int(counts.max()) if counts.size else 0
+    shared = max(a.ndim, b.ndim, c.ndim) < 2
+    if width < responses.shape[1] // 2 and not (shared and method == "eap"):
+        order = np.argsort(~observed, axis=1, kind='stable')[:, :width]
+        responses = np.take_along_axis(responses, order, axis=1)
+        observed = np.take_along_axis(observed, order, axis=1)
+        a, b, c = (
+            np.take_along_axis(np.broadcast_to(x, observed.shape[:1] + x.shape[-1:]), order, axis=1)
+            if x.ndim == 2 else x[order]
+            for x in (a, b, c)
+        )
+    
+    shape = responses.shape
+    u = np.where(observed, responses, 0.0)
+    
+    # Full (students, items) only when given per student, else shared rows
+    a, b, c = (x if x.ndim == 2 else np.broadcast_to(x, shape[1:]) for x in (a, b, c))
+    a_clip = np.clip(a, IRT_A_MIN, IRT_A_MAX)
+    b_clip = np.clip(b, IRT_B_MIN, IRT_B_MAX)
+    c_clip = np.clip(c, IRT_C_MIN, IRT_C_MAX)
+    
+    def rows(x: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        return x[idx] if x.ndim == 2 else x
+    
+    theta = np.array(np.broadcast_to(prior_ability, shape[:1]), dtype=float)
+    standard_error = np.ones(shape[0])
+    has_data = observed.any(axis=1)
+    use_prior = method == "map"
+    
+    if method == "eap":
+        done = np.flatnonzero(has_data)
+        log_posterior = _batch_log_posterior(
+            u[done], observed[done], rows(a, done), rows(b, done), rows(c, done)
+        )
+        theta[done], standard_error[done] = eap_moments(log_posterior)
+        return theta, standard_error
+    
+    def information(idx: np.ndarray, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ai, bi, ci = rows(a, idx), rows(b, idx), rows(c, idx)
+        P = _batch_probability(t, rows(a_clip, idx), rows(b_clip, idx), rows(c_clip, idx))
+        logistic = 1 / (1 + np.exp(-np.clip(ai * (t - bi), -700, 700)))
+        dP_dtheta = ai * (1 - ci) * logistic * (1 - logistic)
+        info = dP_dtheta ** 2 / (P * (1 - P))
+        return P, info
+    
+    active = np.flatnonzero(has_data)
+    for iteration in range(MAX_ITERATIONS):
+        if active.size == 0:
+            break
+        
+        t = theta[active][:, None]
+        mask = observed[active]
+        P, info = information(active, t)
+        
+        ci = rows(c, active)
+        numerator = rows(a, active) * (u[active] - P) * (P - ci)
+        denominator = np.clip(P * (1 - ci), 0.0001, None)
+        first_derivative = np.where(mask, numerator / denominator, 0.0).sum(axis=1)
+        second_derivative = -np.where(mask, info, 0.0).sum(axis=1)
+        
+        current = theta[active]
+        if use_prior:
+            first_derivative -= current
+            second_derivative -= 1
+        
+        stalled = np.abs(second_derivative) < 1e-10
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = first_derivative / np.abs(second_derivative)
+        updated = np.clip(current + 0.5 * delta, ABILITY_MIN, ABILITY_MAX)
+        converged = np.abs(updated - current) < CONVERGENCE_THRESHOLD
+        
+        theta[active] = np.where(stalled, current, updated)
+        active = active[~(stalled | converged)]
+    
+    # Standard errors from total information at the final estimates
+    done = np.flatnonzero(has_data)
+    if done.size:
+        _, info = information(done, theta[done][:, None])
+        total_info = np.where(observed[done], info, 0.0).sum(axis=1)
+        if use_prior:
+            total_info += 1
+        with np.errstate(divide='ignore'):
+            standard_error[done] = np.where(
+                total_info > 0, 1 / np.sqrt(total_info), 1.0
+            )
+    
+    return theta, standard_error
+
+
+def _batch_log_posterior(
+    u: np.ndarray,
+    observed: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray
+) -> np.ndarray:
+    """EAP log posteriors (students, grid) for a response matrix"""
+    log_posterior = np.tile(EAP_LOG_PRIOR, (u.shape[0], 1))
+    
+    if a.ndim == 1 and b.ndim == 1 and c.ndim == 1:
+        # Shared item parameters: two matrix products
+        log_p, log_q = eap_log_likelihood(a, b, c)
+        correct = np.where(observed, u, 0.0)
+        wrong = np.where(observed, 1 - u, 0.0)
+        return log_posterior + correct @ log_p + wrong @ log_q
+    
+    # Per-student parameters: one (students, grid) add per column
+    for column in range(u.shape[1]):
+        log_p, log_q = eap_log_likelihood(
+            np.broadcast_to(a, u.shape)[:, column],
+            np.broadcast_to(b, u.shape)[:, column],
+            np.broadcast_to(c, u.shape)[:, column]
+        )
+        step = np.where(u[:, column, None] > 0.5, log_p, log_q)
+        log_posterior += np.where(observed[:, column, None], step, 0.0)
+    return log_posterior
+
+
+def _batch_probability(
+    theta: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray
+) -> np.ndarray:
+    """irt_probability for pre-clipped parameters (no per-call conversion)"""
+    logit = np.clip(a * (theta - b), -700, 700)
+    return np.clip(c + (1 - c) / (1 + np.exp(-logit)), 0.0001, 0.9999)
+
+
 def ability_to_mastery(ability: float) -> float:
     """
     Convert IRT ability scale to mastery percentage (0-1).
@@ -593,6 +886,90 @@ def calculate_selection_score(
 # CALIBRATION (Parameter Estimation from Response Data)
 # ============================================================================
 
+def fit_item_parameters(
+    theta: np.ndarray,
+    n: np.ndarray,
+    r: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray,
+    c_prior: Optional[Tuple[float, float]] = None,
+    max_iterations: int = 25,
+    tolerance: float = CONVERGENCE_THRESHOLD
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit 3PL parameters for many items at once by Fisher scoring.
+    
+    Each item's data is a set of ability points with (expected) counts:
+    n[j, k] responses at theta[k], r[j, k] of them correct. Fixed
+    abilities are one point per student with n = 1; marginal MLE passes
+    the EM expected counts on the quadrature grid.
+    
+    Args:
+        theta: (points,) shared or (items, points) per item
+        n, r: (items, points) response and correct counts
+        a, b, c: (items,) starting values
+        c_prior: Optional Beta(alpha, beta) prior on c (stabilizes the
+                 guessing parameter on small samples)
+        max_iterations: Scoring steps
+        tolerance: Stop once no parameter moves more than this
+        
+    Returns:
+        (a, b, c, information, converged); information is the (items,
+        3, 3) expected information matrix at the estimates (inverse
+        diagonal = per-parameter variance), converged is per item
+    """
+    theta = np.asarray(theta, dtype=float)
+    params = np.stack([a, b, c], axis=1).astype(float)
+    lower = np.array([IRT_A_MIN, IRT_B_MIN, IRT_C_MIN])
+    upper = np.array([IRT_A_MAX, IRT_B_MAX, IRT_C_MAX])
+    params = np.clip(params, lower, upper)
+    converged = np.zeros(params.shape[0], dtype=bool)
+    ridge = 1e-6 * np.eye(3)
+    
+    def score(params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        a, b, c = (params[:, i, None] for i in range(3))
+        logistic = 1 / (1 + np.exp(-np.clip(a * (theta - b), -700, 700)))
+        P = np.clip(c + (1 - c) * logistic, 0.0001, 0.9999)
+        slope = (1 - c) * logistic * (1 - logistic)
+        dP = np.stack([slope * (theta - b), -slope * a, 1 - logistic], axis=1)
+        weight = 1 / (P * (1 - P))
+        
+        gradient = np.einsum('jpk,jk->jp', dP, (r - n * P) * weight)
+        information = np.einsum('jpk,jqk,jk->jpq', dP, dP, n * weight)
+        if c_prior is not None:
+            alpha, beta = c_prior
+            c = params[:, 2]
+            gradient[:, 2] += (alpha - 1) / c - (beta - 1) / (1 - c)
+            information[:, 2, 2] += (alpha - 1) / c ** 2 + (beta - 1) / (1 - c) ** 2
+        return gradient, information
+    
+    for iteration in range(max_iterations):
+        gradient, information = score(params)
+        step = np.linalg.solve(information + ridge, gradient[..., None])[..., 0]
+        step = np.clip(step, -0.5, 0.5)  # Damped for stability
+        step[converged] = 0.0
+        
+        updated = np.clip(params + step, lower, upper)
+        # c prior has no mass at the bounds
+        if c_prior is not None:
+            updated[:, 2] = np.clip(updated[:, 2], 1e-3, IRT_C_MAX)
+        converged |= np.abs(updated - params).max(axis=1) < tolerance
+        params = updated
+        if converged.all():
+            break
+    
+    _, information = score(params)
+    return params[:, 0], params[:, 1], params[:, 2], information, converged
+
+
+def parameter_standard_errors(information: np.ndarray) -> np.ndarray:
+    """Per-parameter SEs (items, 3) from (items, 3, 3) information matrices"""
+    ridge = 1e-9 * np.eye(information.shape[-1])
+    covariance = np.linalg.inv(information + ridge)
+    return np.sqrt(np.clip(np.diagonal(covariance, axis1=-2, axis2=-1), 0.0, None))
+
+
 def calibrate_question(
     abilities: np.ndarray,
     responses: np.ndarray,
@@ -602,13 +979,13 @@ def calibrate_question(
     """
     Calibrate IRT parameters from student response data.
     
-    Uses Maximum Likelihood Estimation with Newton-Raphson optimization.
+    Uses Maximum Likelihood Estimation with Fisher scoring.
     
     Args:
         abilities: Array of student ability estimates
         responses: Array of 0/1 responses (incorrect/correct)
         initial_params: Starting parameter values
-        method: "mle" or "bayesian"
+        method: "mle" or "bayesian" (Beta prior on c)
         
     Returns:
         Calibrated IRTParameters with standard errors
@@ -619,10 +996,10 @@ def calibrate_question(
     
     Implementation Details:
     Uses joint maximum likelihood with ability estimates fixed.
-    For production, consider marginal MLE or MCMC for better estimates.
+    For whole-bank marginal MLE see item_calibration.calibrate_items.
     """
-    from scipy.optimize import minimize
-    
+    abilities = np.asarray(abilities, dtype=float)
+    responses = np.asarray(responses, dtype=float)
     n = len(responses)
     
     if n < MIN_SAMPLE_SIZE:
@@ -642,65 +1019,26 @@ def calibrate_question(
         b0 = np.mean(abilities[responses == 0]) if np.any(responses == 0) else 0.0
         c0 = IRT_C_DEFAULT
     
-    def negative_log_likelihood(params):
-        """Objective function: negative log-likelihood"""
-        a, b, c = params
-        
-        # Enforce bounds via penalty
-        if a < IRT_A_MIN or a > IRT_A_MAX:
-            return 1e10
-        if b < IRT_B_MIN or b > IRT_B_MAX:
-            return 1e10
-        if c < IRT_C_MIN or c > IRT_C_MAX:
-            return 1e10
-        
-        P = irt_probability(abilities, a, b, c)
-        P = np.clip(P, 0.0001, 0.9999)
-        
-        # Log-likelihood
-        ll = np.sum(
-            responses * np.log(P) + 
-            (1 - responses) * np.log(1 - P)
-        )
-        
-        return -ll
-    
-    # Optimize
-    result = minimize(
-        negative_log_likelihood,
-        x0=[a0, b0, c0],
-        method='L-BFGS-B',
-        bounds=[
-            (IRT_A_MIN, IRT_A_MAX),
-            (IRT_B_MIN, IRT_B_MAX),
-            (IRT_C_MIN, IRT_C_MAX)
-        ],
-        options={'maxiter': MAX_ITERATIONS, 'ftol': CONVERGENCE_THRESHOLD}
+    # One item, one ability point per response
+    a_est, b_est, c_est, information, converged = fit_item_parameters(
+        abilities,
+        np.ones((1, n)),
+        responses[None, :],
+        np.array([a0]), np.array([b0]), np.array([c0]),
+        c_prior=C_PRIOR if method == "bayesian" else None,
+        max_iterations=MAX_ITERATIONS
     )
-    
-    a_est, b_est, c_est = result.x
-    
-    # Calculate standard errors via inverse Hessian
-    # Approximated using observed information
-    try:
-        P = irt_probability(abilities, a_est, b_est, c_est)
-        P = np.clip(P, 0.0001, 0.9999)
-        
-        # Information matrix (simplified)
-        info = np.sum(fisher_information(abilities, a_est, b_est, c_est))
-        se = 1 / np.sqrt(info) if info > 0 else None
-    except:
-        se = None
+    se_a, se_b, se_c = parameter_standard_errors(information)[0]
     
     return IRTParameters(
-        a=a_est,
-        b=b_est,
-        c=c_est,
-        se_a=se,
-        se_b=se,
-        se_c=se,
+        a=float(a_est[0]),
+        b=float(b_est[0]),
+        c=float(c_est[0]),
+        se_a=float(se_a),
+        se_b=float(se_b),
+        se_c=float(se_c),
         sample_size=n,
-        is_calibrated=result.success,
+        is_calibrated=bool(converged[0]),
         calibration_method=method
     )
 
@@ -760,6 +1098,24 @@ def test_fisher_information_maximum():
     print("✅ TEST PASSED: Fisher Information maximum near difficulty")
 
 
+def test_scalar_fast_path():
+    """Test scalar calls match the NumPy path in value and type"""
+    rng = np.random.default_rng(9)
+    cases = [(0.5, 1.5, 0.0, 0.25), (900.0, 1, 0, 0), (-4.0, 5.0, 3.5, -0.1)]
+    cases += [tuple(float(x) for x in rng.uniform([-5, 0, -4, -0.1], [5, 4, 4, 0.6])) for _ in range(500)]
+    
+    for ability, a, b, c in cases:
+        for func in (irt_probability, fisher_information):
+            fast = func(ability, a, b, c)
+            vectorized = func(np.array([ability]), a, b, c)[0]
+            assert type(fast) is np.float64, type(fast)
+            assert np.isclose(fast, vectorized, rtol=1e-12, atol=1e-15), (func.__name__, fast, vectorized)
+    
+    # Any array argument keeps the vectorized result shape
+    assert irt_probability(0.0, np.array([1.0, 2.0]), 0.0, 0.25).shape == (2,)
+    print("✅ TEST PASSED: Scalar fast path matches NumPy path")
+
+
 def test_ability_estimation_correct():
     """Test ability estimation from response pattern"""
     # All correct on medium questions → high ability
@@ -784,6 +1140,62 @@ def test_ability_estimation_incorrect():
     print("✅ TEST PASSED: Ability estimation (all incorrect)")
 
 
+def test_ability_estimation_batch():
+    """Test lock-step batch estimates match per-student estimation"""
+    rng = np.random.default_rng(7)
+    responses, parameters = [], []
+    for student in range(40):
+        n = int(rng.integers(0, 25))
+        params = [
+            IRTParameters(a=rng.uniform(0.5, 2.5), b=rng.uniform(-2.5, 2.5), c=0.2)
+            for _ in range(n)
+        ]
+        responses.append([bool(rng.random() < 0.6) for _ in range(n)])
+        parameters.append(params)
+    
+    packed = pad_responses(responses, parameters)
+    for method in ("mle", "map", "eap"):
+        abilities, errors = estimate_ability_batch(*packed, method=method)
+        for i, (r, p) in enumerate(zip(responses, parameters)):
+            ability, se = estimate_ability(r, p, method=method)
+            assert abs(abilities[i] - ability) < 1e-9, f"{method} student {i}"
+            assert abs(errors[i] - se) < 1e-9, f"{method} SE student {i}"
+    
+    # Shared-bank matrix with NaN for unanswered items
+    a, b, c = np.full(6, 1.2), np.linspace(-2, 2, 6), np.full(6, 0.25)
+    matrix = np.array([
+        [1, 1, 1, np.nan, np.nan, np.nan],
+        [np.nan] * 6,
+        [0, 0, np.nan, np.nan, np.nan, 0],
+    ])
+    abilities, errors = estimate_ability_batch(matrix, a, b, c, prior_ability=0.3)
+    assert abilities[1] == 0.3 and errors[1] == 1.0, "No responses keeps the prior"
+    assert abilities[0] > 0 > abilities[2]
+    
+    print("✅ TEST PASSED: Batch ability estimation")
+
+
+def test_eap_estimation():
+    """Test quadrature EAP against dense integration"""
+    params = [IRTParameters(a=1.4, b=b, c=0.2) for b in (-1.5, -0.5, 0.0, 0.5, 1.5)]
+    responses = [True, True, False, True, False]
+    
+    ability, se = estimate_ability(responses, params, method="eap")
+    
+    # Reference: dense grid integration of the same posterior
+    grid = np.linspace(ABILITY_MIN, ABILITY_MAX, 8001)
+    posterior = np.exp(-0.5 * grid ** 2)
+    for correct, p in zip(responses, params):
+        P = irt_probability(grid, p.a, p.b, p.c)
+        posterior *= P if correct else 1 - P
+    posterior /= posterior.sum()
+    mean = posterior @ grid
+    assert abs(ability - mean) < 0.01, f"EAP {ability} vs integral {mean}"
+    assert abs(se - np.sqrt(posterior @ grid ** 2 - mean ** 2)) < 0.01
+    
+    print("✅ TEST PASSED: EAP estimation")
+
+
 def test_selection_score_match():
     """Test selection score favors difficulty match"""
     ability = 0.5
@@ -820,6 +1232,9 @@ def run_all_tests() -> None:
     test_irt_probability_bounds()
     test_irt_probability_monotonic()
     test_fisher_information_maximum()
+    test_scalar_fast_path()
+    test_ability_estimation_batch()
+    test_eap_estimation()
     test_selection_score_match()
     print("✅ All tests passed!")
 
@@ -832,8 +1247,11 @@ if __name__ == "__main__":
     test_irt_probability_monotonic()
     test_irt_probability_at_b()
     test_fisher_information_maximum()
+    test_scalar_fast_path()
     test_ability_estimation_correct()
     test_ability_estimation_incorrect()
+    test_ability_estimation_batch()
+    test_eap_estimation()
     test_selection_score_match()
     test_mastery_ability_conversion()
     
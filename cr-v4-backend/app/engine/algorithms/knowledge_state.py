@@ -28,8 +28,8 @@ Reference: SAINT paper (Choi et al., 2020), Cognitive Psychology research
 
 import numpy as np
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, time, timedelta
 from collections import deque
 import math
 
@@ -42,6 +42,9 @@ from .irt_model import (
     mastery_to_ability
 )
 
+if TYPE_CHECKING:
+    from .review_scheduler import ReviewScheduler
+
 # ============================================================================
 # CONSTANTS (Tuned for JEE-MAINS learning patterns)
 # ============================================================================
@@ -91,11 +94,80 @@ SPACING_INTERVALS = [1, 3, 7, 14, 30, 60]  # Days between reviews
 CORRECT_BOOST = 0.08        # Boost for correct answer
 INCORRECT_PENALTY = 0.12    # Penalty for incorrect (larger to be conservative)
 
+# Mastery change journal (caches further behind than this recompute fully)
+MASTERY_JOURNAL_SIZE = 256
+
+# Ability estimation
+ABILITY_WINDOW = 50         # Last 50 interactions (difficulty-weighted accuracy)
+IRT_ABILITY_MIN_ITEMS = 10  # Calibrated items in the window before IRT takes over
+
 # Confidence bounds
 MIN_CONFIDENCE = 0.0
 MAX_CONFIDENCE = 1.0
 INITIAL_CONFIDENCE = 0.3    # Low initial confidence
 
+# ============================================================================
+# FORGETTING CURVE
+# ============================================================================
+
+def decayed_scores(
+    concept_state: 'ConceptState',
+    days_since: float
+) -> Tuple[float, float, float]:
+    """
+    Recency, medium and long scores after days_since without practice.
+    
+    COUNCIL FIX: Slower decay with retention floor.
+    
+    Based on Ebbinghaus: R(t) = e^(-t/S)
+    
+    Where:
+    - t = time since last review
+    - S = strength (based on review count)
+    
+    MODIFICATIONS:
+    - Retention floor at 20% (never forget completely)
+    - Slower decay for long-term memory
+    - Subject-specific decay rates
+    
+    Pure function: applied at write time by KnowledgeStateTracker and at
+    read time by decay-aware mastery reads.
+    """
+    if days_since <= 0:
+        return concept_state.recency_score, concept_state.medium_score, concept_state.long_score
+    
+    # Strength increases with more reviews (COUNCIL: boosted for practiced)
+    review_bonus = 1 + (concept_state.long_count * 0.02)  # More reviews = slower decay
+    strength = concept_state.review_interval * concept_state.easiness_factor * review_bonus
+    
+    # Calculate retention (COUNCIL: slower decay for longer periods)
+    # Use sqrt for days > 7 to flatten curve
+    effective_days = days_since if days_since <= 7 else 7 + math.sqrt(days_since - 7)
+    retention = math.exp(-effective_days / max(strength, 1))
+    
+    # Apply decay toward neutral (not zero)
+    neutral = RETENTION_NEUTRAL
+    floor = RETENTION_FLOOR
+    
+    # Recency decays fastest
+    decay_recency = retention ** 1.3  # Was 1.5 - slower
+    new_recency = neutral + (concept_state.recency_score - neutral) * decay_recency
+    
+    # Medium decays moderately
+    decay_medium = retention ** 0.8  # Was 1.0 - slower
+    new_medium = neutral + (concept_state.medium_score - neutral) * decay_medium
+    
+    # Long-term barely decays (COUNCIL: almost stable)
+    decay_long = retention ** 0.2  # Was 0.3 - even slower
+    new_long = neutral + (concept_state.long_score - neutral) * decay_long
+    
+    return max(floor, new_recency), max(floor, new_medium), max(floor, new_long)
+
+
+def days_between(start: datetime, end: datetime) -> float:
+    """Elapsed days (fractional) from start to end"""
+    return (end - start).total_seconds() / 86400
+
 # ============================================================================
 # DATA STRUCTURES
 # ============================================================================
@@ -166,14 +238,22 @@ class ConceptState:
     easiness_factor: float = 2.5    # SM-2 easiness factor
     next_review: Optional[datetime] = None
     
-    def get_combined_mastery(self) -> float:
+    def get_combined_mastery(self, as_of: Optional[datetime] = None) -> float:
         """
         Calculate combined mastery from 3 time scales.
         
         Formula: M = w1*R + w2*M + w3*L
         
-        With dynamic weights based on interaction counts.
+        With dynamic weights based on interaction counts. With as_of, the
+        scores are first decayed for the time since last_interaction
+        (read-time forgetting; the stored scores are not changed).
         """
+        recency, medium, long = self.recency_score, self.medium_score, self.long_score
+        if as_of is not None and self.last_interaction is not None:
+            recency, medium, long = decayed_scores(
+                self, days_between(self.last_interaction, as_of)
+            )
+        
         # Adjust weights based on available data
         r_weight = RECENCY_WEIGHT if self.recency_count > 0 else 0
         m_weight = MEDIUM_WEIGHT if self.medium_count >= 10 else MEDIUM_WEIGHT * 0.5
@@ -190,9 +270,9 @@ class ConceptState:
         
         # Weighted combination
         mastery = (
-            r_weight * self.recency_score +
-            m_weight * self.medium_score +
-            l_weight * self.long_score
+            r_weight * recency +
+            m_weight * medium +
+            l_weight * long
         )
         
         return max(0.0, min(1.0, mastery))
@@ -204,8 +284,13 @@ class ConceptState:
         High stability = consistent performance across time scales
         Low stability = inconsistent (maybe lucky guesses or forgetting)
         """
-        scores = [self.recency_score, self.medium_score, self.long_score]
-        variance = np.var(scores)
+        # Population variance of the 3 scores, in np.var's operation order
+        # (bit-identical, without the array round trip on the update path)
+        mean = (self.recency_score + self.medium_score + self.long_score) / 3
+        d_recency = self.recency_score - mean
+        d_medium = self.medium_score - mean
+        d_long = self.long_score - mean
+        variance = (d_recency * d_recency + d_medium * d_medium + d_long * d_long) / 3
         
         # Low variance = high stability
         # variance of 0 → stability of 1.0
@@ -268,19 +353,192 @@ class StudentKnowledgeState:
     # Performance trends
     daily_averages: Dict[str, float] = field(default_factory=dict)
     
-    def get_concept_mastery(self, concept_id: str) -> float:
-        """Get mastery for a specific concept"""
+    # Mastery change journal: (version, concept_id) per concept update.
+    # Lets per-student caches invalidate only what actually changed.
+    mastery_version: int = 0
+    mastery_journal: deque = field(
+        default_factory=lambda: deque(maxlen=MASTERY_JOURNAL_SIZE)
+    )
+    
+    # Running aggregates, kept current by KnowledgeStateTracker.update_state.
+    # Valid while aggregate_version == mastery_version and aggregate_count
+    # matches concept_states; otherwise rebuilt on next read.
+    mastery_sum: float = field(default=0.0, repr=False, compare=False)
+    aggregate_count: int = field(default=0, repr=False, compare=False)
+    aggregate_version: int = field(default=0, repr=False, compare=False)
+    
+    # Rolling ability window: difficulty-weighted sums over the last
+    # ABILITY_WINDOW interactions, kept current by record_interaction.
+    # Valid while ability_window_total == total_interactions; otherwise
+    # rebuilt from recent_interactions on next read.
+    ability_weight_sum: float = field(default=0.0, repr=False, compare=False)
+    ability_correct_sum: float = field(default=0.0, repr=False, compare=False)
+    ability_window_total: int = field(default=0, repr=False, compare=False)
+    
+    # Decay-aware read memo: concept_id -> mastery decayed to the start
+    # of decay_memo_day (see get_decayed_mastery). Not persisted.
+    decay_memo: Dict[str, float] = field(default_factory=dict, repr=False, compare=False)
+    decay_memo_day: Optional[date] = field(default=None, repr=False, compare=False)
+    
+    def aggregates_current(self) -> bool:
+        """Whether the running aggregates match concept_states"""
+        return (
+            self.aggregate_version == self.mastery_version and
+            self.aggregate_count == len(self.concept_states)
+        )
+    
+    def refresh_aggregates(self):
+        """Rebuild the running aggregates from scratch (O(concepts))"""
+        self.mastery_sum = float(sum(
+            cs.get_combined_mastery() for cs in self.concept_states.values()
+        ))
+        self.aggregate_count = len(self.concept_states)
+        self.aggregate_version = self.mastery_version
+    
+    def ability_window_size(self) -> int:
+        """Interactions in the ability window (bounded by the buffer)"""
+        maxlen = self.recent_interactions.maxlen
+        return ABILITY_WINDOW if maxlen is None else min(ABILITY_WINDOW, maxlen)
+    
+    def refresh_ability_window(self):
+        """Rebuild the ability window sums from the buffer (O(window))"""
+        size = self.ability_window_size()
+        weight_sum = 0.0
+        correct_sum = 0.0
+        for i in range(max(len(self.recent_interactions) - size, 0), len(self.recent_interactions)):
+            interaction = self.recent_interactions[i]
+            weight = 0.5 + 0.5 * interaction.difficulty
+            weight_sum += weight
+            if interaction.correct:
+                correct_sum += weight
+        self.ability_weight_sum = weight_sum
+        self.ability_correct_sum = correct_sum
+        self.ability_window_total = self.total_interactions
+    
+    def ability_window(self) -> Tuple[int, float, float]:
+        """(count, weight sum, correct weight sum) of the ability window"""
+        if self.ability_window_total != self.total_interactions:
+            self.refresh_ability_window()
+        count = min(len(self.recent_interactions), self.ability_window_size())
+        return count, self.ability_weight_sum, self.ability_correct_sum
+    
+    def record_interaction(self, interaction: 'InteractionRecord'):
+        """
+        Append an interaction to the buffer and update the running totals.
+        
+        The ability window sums move in O(1): add the new interaction,
+        subtract the one leaving the window.
+        """
+        recent = self.recent_interactions
+        window_current = self.ability_window_total == self.total_interactions
+        size = self.ability_window_size()
+        
+        if window_current and len(recent) >= size:
+            evicted = recent[-size]
+            weight = 0.5 + 0.5 * evicted.difficulty
+            self.ability_weight_sum -= weight
+            if evicted.correct:
+                self.ability_correct_sum -= weight
+        
+        recent.append(interaction)
+        self.total_interactions += 1
+        if interaction.correct:
+            self.total_correct += 1
+        
+        if window_current:
+            weight = 0.5 + 0.5 * interaction.difficulty
+            self.ability_weight_sum += weight
+            if interaction.correct:
+                self.ability_correct_sum += weight
+            self.ability_window_total = self.total_interactions
+            # Resync once per window so rounding never accumulates
+            if self.total_interactions % size == 0:
+                self.refresh_ability_window()
+    
+    def mark_concept_changed(self, concept_id: str):
+        """Record that a concept's mastery changed"""
+        self.mastery_version += 1
+        self.mastery_journal.append((self.mastery_version, concept_id))
+        self.decay_memo.pop(concept_id, None)
+    
+    def changed_concepts_since(self, version: int) -> Optional[Set[str]]:
+        """
+        Concepts whose mastery changed after a given mastery_version.
+        
+        Returns None when the journal no longer reaches back that far
+        (caller must recompute from scratch).
+        """
+        if version == self.mastery_version:
+            return set()
+        if version > self.mastery_version or not self.mastery_journal:
+            return None
+        if self.mastery_journal[0][0] > version + 1:
+            return None
+        
+        changed = set()
+        for entry_version, concept_id in reversed(self.mastery_journal):
+            if entry_version <= version:
+                break
+            changed.add(concept_id)
+        return changed
+    
+    def get_concept_mastery(self, concept_id: str, as_of: Optional[datetime] = None) -> float:
+        """
+        Get mastery for a specific concept.
+        
+        With as_of, forgetting since the concept was last practiced is
+        applied at read time (see get_decayed_mastery).
+        """
+        if as_of is not None:
+            return self.get_decayed_mastery(concept_id, as_of)
         if concept_id in self.concept_states:
             return self.concept_states[concept_id].get_combined_mastery()
         return 0.5  # Default for unseen concepts
     
-    def get_overall_mastery(self) -> float:
-        """Get average mastery across all attempted concepts"""
+    def get_decayed_mastery(self, concept_id: str, as_of: datetime) -> float:
+        """
+        Mastery with the forgetting curve applied up to as_of's day.
+        
+        Evaluated at the start of that day and memoized per student, so
+        all reads within a day agree and repeats are a dict lookup. A
+        tracker update (mark_concept_changed) drops the concept from the
+        memo; a new day resets it. The
+        stored scores are untouched (the tracker still applies the same
+        decay when the concept is next practiced), so no background sweep
+        over students x concepts is needed.
+        """
+        day = as_of.date()
+        if self.decay_memo_day != day:
+            self.decay_memo = {}
+            self.decay_memo_day = day
+        
+        mastery = self.decay_memo.get(concept_id)
+        if mastery is None:
+            concept_state = self.concept_states.get(concept_id)
+            if concept_state is None:
+                return 0.5  # Default for unseen concepts
+            mastery = concept_state.get_combined_mastery(datetime.combine(day, time.min))
+            self.decay_memo[concept_id] = mastery
+        return mastery
+    
+    def get_overall_mastery(self, as_of: Optional[datetime] = None) -> float:
+        """
+        Get average mastery across all attempted concepts.
+        
+        O(1) from the running aggregates; with as_of, the average of the
+        decay-aware reads (memoized, see get_decayed_mastery).
+        """
         if not self.concept_states:
             return 0.5
         
-        masteries = [cs.get_combined_mastery() for cs in self.concept_states.values()]
-        return np.mean(masteries)
+        if as_of is not None:
+            return sum(
+                self.get_decayed_mastery(cid, as_of) for cid in self.concept_states
+            ) / len(self.concept_states)
+        
+        if not self.aggregates_current():
+            self.refresh_aggregates()
+        return self.mastery_sum / self.aggregate_count
     
     def get_accuracy(self) -> float:
         """Get overall accuracy rate"""
@@ -330,16 +588,33 @@ class KnowledgeStateTracker:
     def __init__(self, 
                  recency_weight: float = RECENCY_WEIGHT,
                  medium_weight: float = MEDIUM_WEIGHT,
-                 long_weight: float = LONG_WEIGHT):
-        """Initialize tracker with configurable weights"""
+                 long_weight: float = LONG_WEIGHT,
+                 item_parameters: Optional[Callable[[str], Optional[IRTParameters]]] = None,
+                 irt_min_items: int = IRT_ABILITY_MIN_ITEMS,
+                 review_scheduler: Optional['ReviewScheduler'] = None):
+        """
+        Initialize tracker with configurable weights.
+        
+        item_parameters (question_id -> IRTParameters or None) opts into
+        IRT ability estimation once the ability window holds at least
+        irt_min_items calibrated questions. Must be picklable for
+        multi-process replay.
+        
+        review_scheduler receives every new SM-2 review date, so due
+        reviews can be found across all students (see review_scheduler).
+        """
         self.recency_weight = recency_weight
         self.medium_weight = medium_weight
         self.long_weight = long_weight
+        self.item_parameters = item_parameters
+        self.irt_min_items = irt_min_items
+        self.review_scheduler = review_scheduler
     
     def update_state(
         self,
         state: StudentKnowledgeState,
-        interaction: InteractionRecord
+        interaction: InteractionRecord,
+        update_ability: bool = True
     ) -> StudentKnowledgeState:
         """
         Update student knowledge state after an interaction.
@@ -356,6 +631,9 @@ class KnowledgeStateTracker:
         Args:
             state: Current student knowledge state
             interaction: New interaction to process
+            update_ability: Re-estimate ability (it only depends on the
+                            final interaction buffer, so bulk ingestion
+                            can skip it for all but the last interaction)
             
         Returns:
             Updated StudentKnowledgeState
@@ -364,14 +642,19 @@ class KnowledgeStateTracker:
         current_time = interaction.timestamp
         
         # Step 1: Get or create concept state
+        # (keep the concept's old mastery to patch the running sum)
+        aggregates_current = state.aggregates_current()
         if concept_id not in state.concept_states:
             state.concept_states[concept_id] = ConceptState(concept_id=concept_id)
+            previous_mastery = 0.0
+        else:
+            previous_mastery = state.concept_states[concept_id].get_combined_mastery()
         
         concept_state = state.concept_states[concept_id]
         
         # Step 2: Apply forgetting decay
         if concept_state.last_interaction is not None:
-            days_since = (current_time - concept_state.last_interaction).total_seconds() / 86400
+            days_since = days_between(concept_state.last_interaction, current_time)
             concept_state = self._apply_decay(concept_state, days_since)
         
         # Step 3: Update all 3 time scales
@@ -381,6 +664,8 @@ class KnowledgeStateTracker:
         
         # Step 4: Update spaced repetition
         concept_state = self._update_spaced_repetition(concept_state, interaction)
+        if self.review_scheduler is not None:
+            self.review_scheduler.schedule(state.student_id, concept_id, concept_state.next_review)
         
         # Step 5: Update confidence
         concept_state.confidence = self._calculate_confidence(concept_state)
@@ -391,19 +676,28 @@ class KnowledgeStateTracker:
             concept_state.last_correct = current_time
         
         state.concept_states[concept_id] = concept_state
+        state.mark_concept_changed(concept_id)
+        
+        if aggregates_current:
+            state.mastery_sum += concept_state.get_combined_mastery() - previous_mastery
+            state.aggregate_count = len(state.concept_states)
+            state.aggregate_version = state.mastery_version
         
         # Update global stats
-        state.recent_interactions.append(interaction)
-        state.total_interactions += 1
-        if interaction.correct:
-            state.total_correct += 1
+        state.record_interaction(interaction)
         state.last_active = current_time
         
         # Update overall ability (using recent interactions)
-        state.ability, state.ability_se = self._estimate_ability(state)
+        if update_ability:
+            self.refresh_ability(state)
         
         return state
     
+    def refresh_ability(self, state: StudentKnowledgeState) -> StudentKnowledgeState:
+        """Re-estimate overall ability from the recent interaction buffer"""
+        state.ability, state.ability_se = self._estimate_ability(state)
+        return state
+    
     def _update_recency(
         self,
         concept_state: ConceptState,
@@ -520,51 +814,16 @@ class KnowledgeStateTracker:
         subject: str = None
     ) -> ConceptState:
         """
-        Apply forgetting curve decay to scores.
-        
-        COUNCIL FIX: Slower decay with retention floor.
-        
-        Based on Ebbinghaus: R(t) = e^(-t/S)
-        
-        Where:
-        - t = time since last review
-        - S = strength (based on review count)
-        
-        MODIFICATIONS:
-        - Retention floor at 20% (never forget completely)
-        - Slower decay for long-term memory
-        - Subject-specific decay rates
+        Apply forgetting curve decay to scores (see decayed_scores).
         """
         if days_since <= 0:
             return concept_state
         
-        # Strength increases with more reviews (COUNCIL: boosted for practiced)
-        review_bonus = 1 + (concept_state.long_count * 0.02)  # More reviews = slower decay
-        strength = concept_state.review_interval * concept_state.easiness_factor * review_bonus
-        
-        # Calculate retention (COUNCIL: slower decay for longer periods)
-        # Use sqrt for days > 7 to flatten curve
-        effective_days = days_since if days_since <= 7 else 7 + math.sqrt(days_since - 7)
-        retention = math.exp(-effective_days / max(strength, 1))
-        
-        # Apply decay toward neutral (not zero)
-        neutral = RETENTION_NEUTRAL
-        floor = RETENTION_FLOOR
-        
-        # Recency decays fastest
-        decay_recency = retention ** 1.3  # Was 1.5 - slower
-        new_recency = neutral + (concept_state.recency_score - neutral) * decay_recency
-        concept_state.recency_score = max(floor, new_recency)
-        
-        # Medium decays moderately
-        decay_medium = retention ** 0.8  # Was 1.0 - slower
-        new_medium = neutral + (concept_state.medium_score - neutral) * decay_medium
-        concept_state.medium_score = max(floor, new_medium)
-        
-        # Long-term barely decays (COUNCIL: almost stable)
-        decay_long = retention ** 0.2  # Was 0.3 - even slower
-        new_long = neutral + (concept_state.long_score - neutral) * decay_long
-        concept_state.long_score = max(floor, new_long)
+        (
+            concept_state.recency_score,
+            concept_state.medium_score,
+            concept_state.long_score
+        ) = decayed_scores(concept_state, days_since)
         
         return concept_state
     
@@ -649,8 +908,9 @@ class KnowledgeStateTracker:
         """
         Estimate overall ability using recent interactions.
         
-        Uses IRT-based estimation if enough data,
-        falls back to simple accuracy otherwise.
+        Uses IRT-based estimation if enough calibrated items (and
+        item_parameters is set), difficulty-weighted accuracy over the
+        rolling window otherwise (O(1) from the running sums).
         """
         if len(state.recent_interactions) < 5:
             # Not enough data - use simple estimate
@@ -658,18 +918,13 @@ class KnowledgeStateTracker:
             ability = mastery_to_ability(accuracy)
             return ability, 1.0  # High uncertainty
         
-        # Use last 50 interactions for ability estimation
-        recent = list(state.recent_interactions)[-50:]
+        if self.item_parameters is not None:
+            estimate = self._estimate_irt_ability(state)
+            if estimate is not None:
+                return estimate
         
-        # Calculate weighted accuracy (weighted by difficulty)
-        total_weight = 0
-        weighted_correct = 0
-        
-        for interaction in recent:
-            weight = 0.5 + 0.5 * interaction.difficulty
-            total_weight += weight
-            if interaction.correct:
-                weighted_correct += weight
+        # Weighted accuracy (weighted by difficulty) over the last 50
+        count, total_weight, weighted_correct = state.ability_window()
         
         if total_weight > 0:
             weighted_accuracy = weighted_correct / total_weight
@@ -679,17 +934,52 @@ class KnowledgeStateTracker:
         ability = mastery_to_ability(weighted_accuracy)
         
         # Standard error decreases with more data
-        se = 1.0 / math.sqrt(len(recent))
+        se = 1.0 / math.sqrt(count)
         
         return ability, se
+    
+    def _estimate_irt_ability(
+        self,
+        state: StudentKnowledgeState
+    ) -> Optional[Tuple[float, float]]:
+        """
+        MAP ability from the calibrated items in the ability window.
+        
+        Newton-Raphson starts from the previous theta (warm start), so a
+        single new response converges in a few steps. None if fewer than
+        irt_min_items calibrated items.
+        """
+        recent = state.recent_interactions
+        responses = []
+        parameters = []
+        for i in range(max(len(recent) - state.ability_window_size(), 0), len(recent)):
+            interaction = recent[i]
+            params = self.item_parameters(interaction.question_id)
+            if params is not None and params.is_calibrated:
+                responses.append(interaction.correct)
+                parameters.append(params)
+        
+        if len(parameters) < self.irt_min_items:
+            return None
+        
+        ability, se = estimate_ability(responses, parameters, prior_ability=state.ability)
+        return float(ability), float(se)
 
 
 # ============================================================================
 # CONVENIENCE FUNCTIONS
 # ============================================================================
 
-def create_student_state(student_id: str) -> StudentKnowledgeState:
-    """Create a new student knowledge state"""
+def create_student_state(student_id: str, columnar: bool = False) -> StudentKnowledgeState:
+    """
+    Create a new student knowledge state.
+    
+    columnar=True stores concept states in typed columns
+    (ColumnarKnowledgeState): same API, far less memory per student.
+    """
+    if columnar:
+        from .columnar_state import ColumnarKnowledgeState
+        return ColumnarKnowledgeState(student_id=student_id)
     return StudentKnowledgeState(student_id=student_id)
 
 
@@ -865,6 +1155,140 @@ def test_stability_calculation():
     print("✅ TEST PASSED: Stability calculation")
 
 
+def test_mastery_journal():
+    """Test change journal reports only concepts updated since a version"""
+    state = create_student_state("TEST_009")
+    
+    state = process_interaction(state, "MATH_001", "Q_1", True, 40.0, 0.5)
+    seen = state.mastery_version
+    
+    assert state.changed_concepts_since(seen) == set()
+    
+    state = process_interaction(state, "MATH_002", "Q_2", True, 40.0, 0.5)
+    state = process_interaction(state, "MATH_003", "Q_3", False, 40.0, 0.5)
+    
+    assert state.changed_concepts_since(seen) == {"MATH_002", "MATH_003"}
+    assert state.changed_concepts_since(0) == {"MATH_001", "MATH_002", "MATH_003"}
+    
+    # Journal overflow forces a full recompute
+    for i in range(MASTERY_JOURNAL_SIZE + 1):
+        state.mark_concept_changed("MATH_004")
+    assert state.changed_concepts_since(seen) is None
+    
+    print("✅ TEST PASSED: Mastery change journal")
+
+
+def test_running_aggregates():
+    """Test overall mastery from running sums matches a full recompute"""
+    state = create_student_state("TEST_010")
+    
+    for i in range(60):
+        state = process_interaction(state, f"MATH_{i % 7:03d}", f"Q_{i}", i % 3 != 0, 40.0, 0.5)
+        assert state.aggregates_current(), "update_state should keep aggregates current"
+        
+        expected = np.mean([cs.get_combined_mastery() for cs in state.concept_states.values()])
+        assert abs(state.get_overall_mastery() - expected) < 1e-9
+    
+    # Concepts inserted behind the tracker's back force a rebuild
+    state.concept_states["PHY_001"] = ConceptState("PHY_001", recency_score=1.0, recency_count=1)
+    assert not state.aggregates_current()
+    expected = np.mean([cs.get_combined_mastery() for cs in state.concept_states.values()])
+    assert abs(state.get_overall_mastery() - expected) < 1e-9
+    assert state.aggregates_current()
+    
+    print("✅ TEST PASSED: Running mastery aggregates")
+
+
+def test_decay_on_read():
+    """Test decay-aware reads match the tracker's decay without mutating"""
+    state = create_student_state("TEST_011")
+    start = datetime(2026, 3, 2, 10, 0)
+    for i in range(12):
+        state = process_interaction(state, "MATH_001", f"Q_{i}", True, 30.0, 0.5,
+                                    start + timedelta(minutes=i))
+    state = process_interaction(state, "MATH_002", "Q_X", False, 90.0, 0.5, start)
+    stored = state.get_concept_mastery("MATH_001")
+    
+    # Same day: nothing to decay yet
+    assert state.get_concept_mastery("MATH_001", as_of=start + timedelta(hours=5)) == stored
+    
+    # 30 days later: the decay the tracker would apply at the start of that day
+    later = start + timedelta(days=30, hours=7)
+    decayed = state.get_concept_mastery("MATH_001", as_of=later)
+    expected = ConceptState(**vars(state.concept_states["MATH_001"]))
+    KnowledgeStateTracker()._apply_decay(
+        expected, days_between(expected.last_interaction, datetime(2026, 4, 1))
+    )
+    assert decayed == expected.get_combined_mastery()
+    assert 0.5 < decayed < stored, "High mastery decays toward neutral"
+    assert state.get_concept_mastery("MATH_002", as_of=later) > state.get_concept_mastery("MATH_002")
+    assert state.get_concept_mastery("MATH_001") == stored, "Stored scores untouched"
+    assert state.get_concept_mastery("UNSEEN", as_of=later) == 0.5
+    
+    # Memoized for the day; practice drops the entry; a new day resets
+    assert state.decay_memo["MATH_001"] == decayed
+    assert state.get_concept_mastery("MATH_001", as_of=later - timedelta(hours=6)) == decayed
+    state = process_interaction(state, "MATH_001", "Q_Y", True, 30.0, 0.5, later)
+    assert "MATH_001" not in state.decay_memo
+    assert state.get_concept_mastery("MATH_001", as_of=later) == state.get_concept_mastery("MATH_001")
+    overall = state.get_overall_mastery(as_of=later)
+    expected = np.mean([state.get_concept_mastery(c, as_of=later) for c in ("MATH_001", "MATH_002")])
+    assert abs(overall - expected) < 1e-12
+    
+    state.get_concept_mastery("MATH_002", as_of=later + timedelta(days=1))
+    assert state.decay_memo_day == (later + timedelta(days=1)).date()
+    assert list(state.decay_memo) == ["MATH_002"]
+    
+    print("✅ TEST PASSED: Decay-aware mastery reads")
+
+
+def test_ability_window():
+    """Test the rolling ability window and the IRT ability mode"""
+    state = create_student_state("TEST_012")
+    tracker = KnowledgeStateTracker()
+    start = datetime(2026, 3, 2, 10, 0)
+    
+    for i in range(230):
+        interaction = InteractionRecord(f"MATH_{i % 4:03d}", f"Q_{i % 40}", i % 3 != 0 or i > 150,
+                                        start + timedelta(minutes=i), 30.0, (i % 11) / 10)
+        tracker.update_state(state, interaction)
+        
+        # Reference: full recompute over the last 50
+        recent = list(state.recent_interactions)[-ABILITY_WINDOW:]
+        weights = [0.5 + 0.5 * r.difficulty for r in recent]
+        correct = sum(w for w, r in zip(weights, recent) if r.correct)
+        assert state.ability_window_total == state.total_interactions
+        assert abs(state.ability_weight_sum - sum(weights)) < 1e-9
+        assert abs(state.ability_correct_sum - correct) < 1e-9
+        if len(recent) >= 5:
+            assert abs(state.ability - mastery_to_ability(correct / sum(weights))) < 1e-9
+            assert state.ability_se == 1.0 / math.sqrt(len(recent))
+    
+    # Buffer rebuilt behind the tracker's back (e.g. decoded) resyncs on read
+    stale = StudentKnowledgeState("TEST_012", recent_interactions=deque(state.recent_interactions, maxlen=MEDIUM_WINDOW),
+                                  total_interactions=state.total_interactions)
+    assert tracker.refresh_ability(stale).ability == state.ability
+    
+    # IRT mode: warm-started MAP once enough items are calibrated
+    calibrated = {f"Q_{q}": IRTParameters(a=1.2, b=(q % 9 - 4) / 2, c=0.2, is_calibrated=q < 30)
+                  for q in range(40)}
+    irt = KnowledgeStateTracker(item_parameters=calibrated.get)
+    irt_state = create_student_state("TEST_013")
+    for interaction in list(state.recent_interactions)[-8:]:
+        irt.update_state(irt_state, interaction)
+    assert irt_state.ability == KnowledgeStateTracker().refresh_ability(irt_state).ability, "Too few items"
+    
+    for interaction in state.recent_interactions:
+        irt.update_state(irt_state, interaction)
+    window = list(irt_state.recent_interactions)[-ABILITY_WINDOW:]
+    items = [(r.correct, calibrated[r.question_id]) for r in window if calibrated[r.question_id].is_calibrated]
+    cold, cold_se = estimate_ability([c for c, _ in items], [p for _, p in items])
+    assert abs(irt_state.ability - cold) < 1e-4, "Warm start converges to the same theta"
+    assert abs(irt_state.ability_se - cold_se) < 1e-4
+    
+    print("✅ TEST PASSED: Rolling ability window")
+
+
 # ============================================================================
 # RUN ALL TESTS
 # ============================================================================
@@ -878,6 +1302,10 @@ def run_all_tests() -> None:
     test_multiple_incorrect()
     test_mixed_performance()
     test_three_time_scales()
+    test_mastery_journal()
+    test_running_aggregates()
+    test_decay_on_read()
+    test_ability_window()
     print("✅ All tests passed!")
 
 if __name__ == "__main__":
@@ -893,6 +1321,10 @@ if __name__ == "__main__":
     test_three_time_scales()
     test_spaced_repetition()
     test_stability_calculation()
+    test_mastery_journal()
+    test_running_aggregates()
+    test_decay_on_read()
+    test_ability_window()
     
     print("\n" + "="*70)
     print("ALL KNOWLEDGE STATE TESTS PASSED ✅")
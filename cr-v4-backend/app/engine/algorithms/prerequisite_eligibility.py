@@ -0,0 +1,289 @@
+"""
+CR-V4 CORE ALGORITHMS
+Module: Prerequisite Eligibility Bitmaps
+
+Per-student "is this concept unlocked?" bitmap over the bank's concept
+table, maintained incrementally.
+
+A concept is unlocked when every prerequisite meets the minimum mastery of
+its subject's strategy (SUBJECT_STRATEGIES). Subjects that don't enforce
+prerequisites are always unlocked.
+
+Incremental maintenance:
+- The student's mastery change journal says which concepts changed
+- Only the dependents of those concepts (ConceptNode.enables, plus the
+  reverse of ConceptNode.prerequisites) are re-evaluated
+- Candidate filtering is then a single gather + AND:
+      mask &= bitmap[concept_idx[pool]]
+"""
+
+import numpy as np
+import weakref
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+
+from .knowledge_state import StudentKnowledgeState
+from .question_selector import ConceptNode, SUBJECT_STRATEGIES
+
+if TYPE_CHECKING:
+    from .question_columns import QuestionColumns
+
+
+# ============================================================================
+# ELIGIBILITY INDEX
+# ============================================================================
+
+class PrerequisiteEligibility:
+    """
+    Incrementally maintained prerequisite bitmaps, one per student.
+
+    One instance can be shared by every selector built on the same
+    concept graph.
+    """
+
+    def __init__(self, concepts: Dict[str, ConceptNode]):
+        self.concepts = concepts
+
+        # concept -> concepts whose eligibility depends on it
+        self._dependents: Dict[str, Set[str]] = {}
+        for concept_id, node in concepts.items():
+            for successor in node.enables:
+                self._dependents.setdefault(concept_id, set()).add(successor)
+            for prereq_id in node.prerequisites:
+                self._dependents.setdefault(prereq_id, set()).add(concept_id)
+
+        # Gated concept codes, rebuilt when the bank snapshot changes
+        self._gated: List[Tuple[int, str]] = []
+        self._gated_source = None
+
+        # student_id -> (state ref, mastery_version, bitmap)
+        self._bitmaps: Dict[str, Tuple[weakref.ref, int, np.ndarray]] = {}
+
+    def is_gated(self, concept_id: str) -> bool:
+        """Whether a concept's subject enforces prerequisites"""
+        node = self.concepts.get(concept_id)
+        if node is None or not node.prerequisites:
+            return False
+        strategy = SUBJECT_STRATEGIES.get(node.subject, {})
+        return strategy.get('enforce_prerequisites', False)
+
+    def is_unlocked(
+        self,
+        concept_id: str,
+        student_state: StudentKnowledgeState
+    ) -> bool:
+        """Evaluate one concept against its subject's prerequisite threshold"""
+        if not self.is_gated(concept_id):
+            return True
+
+        node = self.concepts[concept_id]
+        strategy = SUBJECT_STRATEGIES.get(node.subject, {})
+        min_mastery = strategy.get('min_prereq_mastery', 0.50)
+
+        for prereq_id in node.prerequisites:
+            if student_state.get_concept_mastery(prereq_id) < min_mastery:
+                return False
+        return True
+
+    def bitmap(
+        self,
+        columns: 'QuestionColumns',
+        student_state: StudentKnowledgeState
+    ) -> np.ndarray:
+        """
+        Unlocked flag per concept code of the bank snapshot.
+
+        Updated in place from the student's mastery change journal; only
+        rebuilt from scratch for new students, re-encoded bank snapshots
+        or when the journal has overflowed.
+        """
+        self._sync_columns(columns)
+
+        cached = self._bitmaps.get(student_state.student_id)
+        if cached is not None and cached[0]() is student_state:
+            changed = student_state.changed_concepts_since(cached[1])
+            if changed is not None:
+                bitmap = cached[2]
+                for concept_id in changed:
+                    self._refresh_dependents(
+                        columns, student_state, concept_id, bitmap
+                    )
+                if changed:
+                    self._bitmaps[student_state.student_id] = (
+                        cached[0], student_state.mastery_version, bitmap
+                    )
+                if bitmap.shape[0] < len(columns.concept_ids):
+                    bitmap = self._grow(bitmap, columns, student_state)
+                    self._bitmaps[student_state.student_id] = (
+                        cached[0], student_state.mastery_version, bitmap
+                    )
+                return bitmap
+
+        bitmap = np.ones(len(columns.concept_ids), dtype=bool)
+        for code, concept_id in self._gated:
+            bitmap[code] = self.is_unlocked(concept_id, student_state)
+
+        self._bitmaps[student_state.student_id] = (
+            weakref.ref(student_state), student_state.mastery_version, bitmap
+        )
+        return bitmap
+
+    def forget(self, student_id: str) -> None:
+        """Drop a student's bitmap (e.g. when their state is evicted)"""
+        self._bitmaps.pop(student_id, None)
+
+    def _refresh_dependents(
+        self,
+        columns: 'QuestionColumns',
+        student_state: StudentKnowledgeState,
+        concept_id: str,
+        bitmap: np.ndarray
+    ) -> None:
+        for dependent_id in self._dependents.get(concept_id, ()):
+            code = columns.concept_index(dependent_id)
+            if code is not None:
+                bitmap[code] = self.is_unlocked(dependent_id, student_state)
+
+    def _grow(
+        self,
+        bitmap: np.ndarray,
+        columns: 'QuestionColumns',
+        student_state: StudentKnowledgeState
+    ) -> np.ndarray:
+        """Extend a bitmap with the concept codes a bank delta appended"""
+        grown = np.ones(len(columns.concept_ids), dtype=bool)
+        grown[:bitmap.shape[0]] = bitmap
+        for code, concept_id in self._gated:
+            if code >= bitmap.shape[0]:
+                grown[code] = self.is_unlocked(concept_id, student_state)
+        return grown
+
+    def _sync_columns(self, columns: 'QuestionColumns') -> None:
+        if self._gated_source is columns:
+            return
+        previous = self._gated_source
+        self._gated = [
+            (code, concept_id)
+            for code, concept_id in enumerate(columns.concept_ids)
+            if self.is_gated(concept_id)
+        ]
+        self._gated_source = columns
+
+        # Patched snapshots (QuestionColumns.with_changes) only append
+        # concept codes, so existing bitmaps stay valid: shorter ones are
+        # grown on demand and longer ones still index correctly
+        if previous is not None:
+            old_codes, new_codes = previous.concept_ids, columns.concept_ids
+            shorter = min(len(old_codes), len(new_codes))
+            if old_codes[:shorter] == new_codes[:shorter]:
+                return
+        self._bitmaps.clear()
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+def _chain_fixture():
+    from .irt_model import IRTParameters
+    from .question_selector import Question
+    from .question_registry import QuestionRegistry
+
+    concepts = {
+        f"MATH_{i:03d}": ConceptNode(
+            f"MATH_{i:03d}", "MATH", f"C{i}",
+            prerequisites=[f"MATH_{i - 1:03d}"] if i > 0 else [],
+            enables=[f"MATH_{i + 1:03d}"] if i < 5 else []
+        )
+        for i in range(6)
+    }
+    concepts["PHYS_001"] = ConceptNode(
+        "PHYS_001", "PHYSICS", "Kinematics", prerequisites=["MATH_005"]
+    )
+    questions = [
+        Question(f"Q_{cid}", cid, node.subject, IRTParameters())
+        for cid, node in concepts.items()
+    ]
+    return concepts, QuestionRegistry(questions).get_columns()
+
+
+def test_bitmap_initial_state():
+    """Test only gated subjects are locked for a new student"""
+    from .knowledge_state import create_student_state
+
+    concepts, columns = _chain_fixture()
+    eligibility = PrerequisiteEligibility(concepts)
+    bitmap = eligibility.bitmap(columns, create_student_state("TEST_001"))
+
+    unlocked = {cid for cid in columns.concept_ids if bitmap[columns.concept_index(cid)]}
+    # Unseen prerequisites sit at 0.5 < 0.60 Math threshold
+    assert unlocked == {"MATH_000", "PHYS_001"}, f"Got {unlocked}"
+
+    print("✅ TEST PASSED: Bitmap initial state")
+
+
+def test_bitmap_incremental_matches_full():
+    """Test incremental updates agree with a from-scratch rebuild"""
+    from .knowledge_state import create_student_state, process_interaction
+
+    concepts, columns = _chain_fixture()
+    eligibility = PrerequisiteEligibility(concepts)
+    state = create_student_state("TEST_002")
+    eligibility.bitmap(columns, state)
+
+    answers = [("MATH_000", True)] * 6 + [("MATH_001", True)] * 6 + \
+              [("MATH_000", False)] * 8 + [("MATH_002", True)] * 3
+    for i, (concept_id, correct) in enumerate(answers):
+        state = process_interaction(state, concept_id, f"Q_{i}", correct, 30.0, 0.6)
+
+        incremental = eligibility.bitmap(columns, state).copy()
+        full = PrerequisiteEligibility(concepts).bitmap(columns, state)
+        assert np.array_equal(incremental, full), f"Mismatch after answer {i}"
+
+    print("✅ TEST PASSED: Incremental bitmap matches full rebuild")
+
+
+def test_bitmap_reevaluates_dependents_only():
+    """Test a mastery change only re-evaluates that concept's dependents"""
+    from .knowledge_state import create_student_state, process_interaction
+
+    concepts, columns = _chain_fixture()
+    eligibility = PrerequisiteEligibility(concepts)
+    state = create_student_state("TEST_003")
+    eligibility.bitmap(columns, state)
+
+    evaluated = []
+    original = eligibility.is_unlocked
+    eligibility.is_unlocked = lambda cid, st: evaluated.append(cid) or original(cid, st)
+
+    state = process_interaction(state, "MATH_002", "Q_1", True, 30.0, 0.5)
+    eligibility.bitmap(columns, state)
+
+    assert evaluated == ["MATH_003"], f"Re-evaluated {evaluated}"
+
+    print("✅ TEST PASSED: Only dependents re-evaluated")
+
+
+# ============================================================================
+# RUN ALL TESTS
+# ============================================================================
+
+def run_all_tests() -> None:
+    """Run all Prerequisite Eligibility tests. Called by CI/CD pipeline."""
+    print("Running Prerequisite Eligibility tests...")
+    test_bitmap_initial_state()
+    test_bitmap_incremental_matches_full()
+    test_bitmap_reevaluates_dependents_only()
+    print("✅ All tests passed!")
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("CR-V4 PREREQUISITE ELIGIBILITY TESTS")
+    print("="*70 + "\n")
+
+    test_bitmap_initial_state()
+    test_bitmap_incremental_matches_full()
+    test_bitmap_reevaluates_dependents_only()
+
+    print("\n" + "="*70)
+    print("ALL PREREQUISITE ELIGIBILITY TESTS PASSED ✅")
+    print("="*70 + "\n")
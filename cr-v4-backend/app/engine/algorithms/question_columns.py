@@ -0,0 +1,257 @@
+"""
+CR-V4 CORE ALGORITHMS
+Module: Columnar Question Bank
+
+Struct-of-arrays view of the question bank for vectorized scoring.
+
+Every per-question attribute the selector reads on the hot path lives in a
+contiguous NumPy array indexed by row:
+- a, b, c: IRT parameters (float64)
+- concept_idx, subject_idx, competency_idx: dictionary-encoded ids (int32)
+- competency_weight: NEP 2020 weight (float64)
+- selectable: ACTIVE syllabus, not NEP removed, not retired (bool)
+
+Tabulated P / Fisher information curves (ResponseTables, opt-in) are
+built on first use and cached with the snapshot.
+
+Scoring a pool of candidates is then a handful of array operations instead
+of one Python call (and one NumPy round-trip) per question.
+
+Rows follow the registry's insertion order, so "first best row" matches the
+stable-sort tie-break of the original per-question loop.
+"""
+
+import copy
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .irt_tables import ResponseTables
+from .question_selector import (
+    Question,
+    COMPETENCY_WEIGHTS,
+    NEP_REMOVED_CONCEPTS
+)
+
+
+# ============================================================================
+# COLUMNAR STORE
+# ============================================================================
+
+class QuestionColumns:
+    """
+    Immutable columnar snapshot of a list of questions.
+
+    Built by QuestionRegistry.get_columns(). Small registry deltas derive
+    a patched copy with with_changes() instead of a full rebuild; retired
+    rows then stay in the arrays (inactive) so row numbers don't shift.
+    """
+
+    def __init__(self, questions: Sequence[Question]):
+        self._questions = list(questions)
+        n = len(self._questions)
+
+        self.question_ids: List[str] = [q.question_id for q in self._questions]
+        self._row_by_id: Dict[str, int] = {
+            qid: row for row, qid in enumerate(self.question_ids)
+        }
+
+        # Dictionary-encoded concept and subject ids
+        self.concept_ids: List[str] = []
+        self._concept_index: Dict[str, int] = {}
+        self.subjects: List[str] = []
+        self._subject_index: Dict[str, int] = {}
+        self.competency_types: List[str] = []
+        self._competency_index: Dict[str, int] = {}
+
+        self.a = np.empty(n, dtype=np.float64)
+        self.b = np.empty(n, dtype=np.float64)
+        self.c = np.empty(n, dtype=np.float64)
+        self.concept_idx = np.empty(n, dtype=np.int32)
+        self.subject_idx = np.empty(n, dtype=np.int32)
+        self.competency_idx = np.empty(n, dtype=np.int32)
+        self.competency_weight = np.empty(n, dtype=np.float64)
+        self.selectable = np.empty(n, dtype=bool)
+        self.active = np.ones(n, dtype=bool)
+
+        # Tabulated P / I curves by error bound; built lazily
+        self._response_tables: Dict[float, ResponseTables] = {}
+
+        for row, q in enumerate(self._questions):
+            self._fill_row(row, q)
+
+        self._index_rows()
+
+    def _fill_row(self, row: int, q: Question) -> None:
+        self.a[row] = q.irt_params.a
+        self.b[row] = q.irt_params.b
+        self.c[row] = q.irt_params.c
+        self.concept_idx[row] = self._encode(
+            q.concept_id, self.concept_ids, self._concept_index
+        )
+        self.subject_idx[row] = self._encode(
+            q.subject, self.subjects, self._subject_index
+        )
+        self.competency_idx[row] = self._encode(
+            q.competency_type.value, self.competency_types, self._competency_index
+        )
+        self.competency_weight[row] = COMPETENCY_WEIGHTS.get(
+            q.competency_type.value, 0.5
+        )
+        self.selectable[row] = (
+            self.active[row] and
+            q.is_active() and
+            q.concept_id not in NEP_REMOVED_CONCEPTS
+        )
+
+    def _index_rows(self) -> None:
+        self._all_rows = np.flatnonzero(self.active)
+        self._rows_by_subject: Dict[str, np.ndarray] = {
+            subject: np.flatnonzero(self.active & (self.subject_idx == idx))
+            for idx, subject in enumerate(self.subjects)
+        }
+
+    def with_changes(
+        self,
+        replaced: Sequence[Question] = (),
+        retired: Iterable[str] = (),
+        added: Sequence[Question] = ()
+    ) -> 'QuestionColumns':
+        """
+        Patched copy for a small registry delta (this snapshot is untouched).
+
+        Args:
+            replaced: New versions of active questions (same id, same row)
+            retired: Ids to deactivate
+            added: New rows, appended in order
+
+        Cost is a copy of each array plus O(changes), instead of the O(n)
+        Python loop of a full rebuild.
+        """
+        patched = copy.copy(self)
+        n = len(self._questions)
+        total = n + len(added)
+
+        patched._questions = self._questions + list(added)
+        patched.question_ids = self.question_ids + [q.question_id for q in added]
+        patched._row_by_id = dict(self._row_by_id)
+        patched.concept_ids = list(self.concept_ids)
+        patched._concept_index = dict(self._concept_index)
+        patched.subjects = list(self.subjects)
+        patched._subject_index = dict(self._subject_index)
+        patched.competency_types = list(self.competency_types)
+        patched._competency_index = dict(self._competency_index)
+
+        for name in ('a', 'b', 'c', 'concept_idx', 'subject_idx', 'competency_idx',
+                     'competency_weight', 'selectable', 'active'):
+            column = getattr(self, name)
+            grown = np.empty(total, dtype=column.dtype)
+            grown[:n] = column
+            setattr(patched, name, grown)
+        patched.active[n:] = True
+
+        for row, q in enumerate(added, start=n):
+            patched._row_by_id[q.question_id] = row
+            patched._fill_row(row, q)
+
+        for q in replaced:
+            row = patched._row_by_id[q.question_id]
+            patched._questions[row] = q
+            patched._fill_row(row, q)
+
+        for question_id in retired:
+            row = patched._row_by_id.get(question_id)
+            if row is not None:
+                patched.active[row] = False
+                patched.selectable[row] = False
+
+        changed_rows = [patched._row_by_id[q.question_id] for q in replaced]
+        patched._response_tables = {
+            max_error: tables.with_changes(patched.a, patched.b, patched.c, changed_rows)
+            for max_error, tables in self._response_tables.items()
+        }
+
+        patched._index_rows()
+        return patched
+
+    @staticmethod
+    def _encode(value: str, table: List[str], index: Dict[str, int]) -> int:
+        code = index.get(value)
+        if code is None:
+            code = len(table)
+            table.append(value)
+            index[value] = code
+        return code
+
+    def __len__(self) -> int:
+        """Rows, inactive ones included (size of row-indexed arrays)"""
+        return len(self.question_ids)
+
+    # ------------------------------------------------------------------
+    # Row lookup
+    # ------------------------------------------------------------------
+
+    def question_at(self, row: int) -> Question:
+        """Question object for a row"""
+        return self._questions[int(row)]
+
+    def row_of(self, question_id: str) -> Optional[int]:
+        """Row for an active question id (None if not in the snapshot)"""
+        row = self._row_by_id.get(question_id)
+        if row is None or not self.active[row]:
+            return None
+        return row
+
+    def rows_for_ids(self, question_ids: Iterable[str]) -> np.ndarray:
+        """Rows for the question ids present in the snapshot"""
+        rows = [self._row_by_id[qid] for qid in question_ids if qid in self._row_by_id]
+        return np.asarray(rows, dtype=np.int64)
+
+    def rows_for_subject(self, subject: Optional[str]) -> np.ndarray:
+        """Active rows for a subject in bank order (all if subject is None)"""
+        if subject is None:
+            return self._all_rows
+        return self._rows_by_subject.get(subject, self._all_rows[:0])
+
+    def response_tables(self, max_error: float) -> ResponseTables:
+        """Tabulated P(θ) / I(θ) for every row within max_error"""
+        tables = self._response_tables.get(max_error)
+        if tables is None:
+            tables = self._response_tables[max_error] = ResponseTables(
+                self.a, self.b, self.c, max_error=max_error
+            )
+        return tables
+
+    def concept_index(self, concept_id: str) -> Optional[int]:
+        """Dictionary code of a concept (None if no question uses it)"""
+        return self._concept_index.get(concept_id)
+
+    def subject_index(self, subject: str) -> Optional[int]:
+        """Dictionary code of a subject (None if no question uses it)"""
+        return self._subject_index.get(subject)
+
+
+# ============================================================================
+# VECTOR HELPERS
+# ============================================================================
+
+def top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k highest scores, best first.
+
+    Uses argpartition (O(n)) to cut the pool to k before sorting, so the
+    cost is O(n + k log k). Ties keep their original order, matching a
+    stable descending sort of the full array.
+    """
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+
+    top = np.argpartition(-scores, k - 1)[:k]
+    # Pull in every position tied with the k-th score so the stable
+    # tie-break is decided on the full tie group, not argpartition's pick
+    kth = scores[top].min()
+    top = np.flatnonzero(scores >= kth)
+    order = np.argsort(-scores[top], kind='stable')
+    return top[order][:k]
@@ -0,0 +1,333 @@
+"""
+CR-V4 CORE ALGORITHMS
+Module: Review Scheduler
+
+Platform-wide spaced-repetition queue: which students have concept
+reviews due, without scanning every student's concept states.
+
+1. One time-ordered binary heap of (next_review, seq, student, concept)
+   over all students; KnowledgeStateTracker pushes the new SM-2 date
+   every time a concept is practiced
+2. Rescheduling is lazy: a (student, concept) index holds the live
+   entry's seq, superseded heap entries are skipped when reached and
+   the heap is compacted once they outnumber the live ones
+3. pop_due extracts due reviews in O(log n) each (e.g. for a worker
+   sending notifications); due() answers "due in the next N hours"
+   without removing anything, visiting only the heap nodes in range
+
+Usage:
+    scheduler = ReviewScheduler()
+    tracker = KnowledgeStateTracker(review_scheduler=scheduler)
+    ...
+    batch = scheduler.due(datetime.now(), within=timedelta(hours=12))
+"""
+
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .knowledge_state import StudentKnowledgeState
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+COMPACT_MIN_STALE = 1024    # Never compact small heaps
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class ReviewScheduler:
+    """
+    Time-ordered queue of (student, concept) reviews across all students.
+
+    Each (student, concept) has at most one live review; scheduling it
+    again replaces the previous date. Times are naive datetimes, like
+    ConceptState.next_review.
+
+    Thread-safe; one scheduler can be shared by concurrent requests.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, str, str]] = []
+        self._live: Dict[str, Dict[str, Tuple[datetime, int]]] = {}
+        self._count = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getstate__(self) -> Dict:
+        # Picklable (e.g. passed to shard processes); each copy then
+        # schedules the students it serves
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_seq'] = next(self._seq)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._seq = itertools.count(state['_seq'])
+        self._lock = threading.Lock()
+
+    def schedule(self, student_id: str, concept_id: str, next_review: Optional[datetime]) -> None:
+        """Set (or with None, cancel) the next review of a student's concept"""
+        with self._lock:
+            if next_review is None:
+                self._drop(student_id, concept_id)
+                return
+            self._push(student_id, concept_id, next_review)
+            self._maybe_compact()
+
+    def track_state(self, state: StudentKnowledgeState) -> int:
+        """
+        Replace a student's reviews with those in a knowledge state
+        (e.g. loaded, imported or rebuilt outside the tracker).
+
+        Returns:
+            Number of reviews scheduled
+        """
+        reviews = [
+            (concept_id, concept_state.next_review)
+            for concept_id, concept_state in state.concept_states.items()
+            if concept_state.next_review is not None
+        ]
+        with self._lock:
+            self._forget(state.student_id)
+            for concept_id, next_review in reviews:
+                self._push(state.student_id, concept_id, next_review)
+            self._maybe_compact()
+        return len(reviews)
+
+    def forget_student(self, student_id: str) -> int:
+        """Drop all of a student's reviews; returns how many there were"""
+        with self._lock:
+            return self._forget(student_id)
+
+    def next_review(self, student_id: str, concept_id: str) -> Optional[datetime]:
+        """Scheduled review of a student's concept (None if not scheduled)"""
+        entry = self._live.get(student_id, {}).get(concept_id)
+        return entry[0] if entry else None
+
+    def next_due(self) -> Optional[datetime]:
+        """Earliest scheduled review across all students"""
+        with self._lock:
+            self._skip_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(
+        self,
+        now: datetime,
+        within: timedelta = timedelta(0),
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, str, datetime]]:
+        """
+        Remove and return reviews due by now + within, earliest first.
+
+        O(log n) per review. Popped reviews are rescheduled when the
+        concept is practiced again.
+
+        Returns:
+            (student_id, concept_id, next_review) tuples
+        """
+        horizon = now + within
+        due = []
+        with self._lock:
+            while limit is None or len(due) < limit:
+                self._skip_stale()
+                if not self._heap or self._heap[0][0] > horizon:
+                    break
+                next_review, _, student_id, concept_id = heapq.heappop(self._heap)
+                self._drop(student_id, concept_id)
+                due.append((student_id, concept_id, next_review))
+        return due
+
+    def due(self, now: datetime, within: timedelta = timedelta(0)) -> Dict[str, List[str]]:
+        """
+        Reviews due by now + within, grouped by student (earliest first).
+
+        Leaves the queue untouched. Walks the heap as a tree and prunes
+        every subtree whose root is past the horizon, so the cost grows
+        with the reviews in range, not with the queue.
+        """
+        horizon = now + within
+        found = []
+        with self._lock:
+            heap = self._heap
+            pending = [0] if heap else []
+            while pending:
+                i = pending.pop()
+                entry = heap[i]
+                if entry[0] > horizon:
+                    continue
+                if self._is_live(entry):
+                    found.append(entry)
+                pending.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(heap))
+
+        found.sort()
+        by_student: Dict[str, List[str]] = {}
+        for _, _, student_id, concept_id in found:
+            by_student.setdefault(student_id, []).append(concept_id)
+        return by_student
+
+    def _push(self, student_id: str, concept_id: str, next_review: datetime) -> None:
+        seq = next(self._seq)
+        concepts = self._live.setdefault(student_id, {})
+        if concept_id not in concepts:
+            self._count += 1
+        concepts[concept_id] = (next_review, seq)
+        heapq.heappush(self._heap, (next_review, seq, student_id, concept_id))
+
+    def _drop(self, student_id: str, concept_id: str) -> None:
+        concepts = self._live.get(student_id)
+        if concepts and concepts.pop(concept_id, None) is not None:
+            self._count -= 1
+            if not concepts:
+                del self._live[student_id]
+
+    def _forget(self, student_id: str) -> int:
+        concepts = self._live.pop(student_id, {})
+        self._count -= len(concepts)
+        return len(concepts)
+
+    def _is_live(self, entry: Tuple[datetime, int, str, str]) -> bool:
+        live = self._live.get(entry[2], {}).get(entry[3])
+        return live is not None and live[1] == entry[1]
+
+    def _skip_stale(self) -> None:
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heap from live entries once stale ones dominate"""
+        stale = len(self._heap) - self._count
+        if stale > COMPACT_MIN_STALE and stale > self._count:
+            self._heap = [
+                (next_review, seq, student_id, concept_id)
+                for student_id, concepts in self._live.items()
+                for concept_id, (next_review, seq) in concepts.items()
+            ]
+            heapq.heapify(self._heap)
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+def test_review_scheduler():
+    """Test due extraction, rescheduling and range queries"""
+    import random
+
+    scheduler = ReviewScheduler()
+    now = datetime(2026, 5, 4, 9, 0)
+    rng = random.Random(3)
+    expected: Dict[Tuple[str, str], datetime] = {}
+
+    # Repeated rescheduling leaves stale heap entries behind
+    for n in range(20000):
+        key = (f"STU_{rng.randrange(300):03d}", f"MATH_{rng.randrange(20):03d}")
+        when = now + timedelta(hours=rng.uniform(-48, 240))
+        scheduler.schedule(*key, when)
+        expected[key] = when
+    assert len(scheduler) == len(expected)
+    assert len(scheduler._heap) < 3 * len(expected) + COMPACT_MIN_STALE, "Compaction bounds the heap"
+    assert scheduler.next_due() == min(expected.values())
+
+    # Range query == full scan, queue untouched
+    for hours in (0, 6, 72):
+        horizon = now + timedelta(hours=hours)
+        batch = scheduler.due(now, within=timedelta(hours=hours))
+        scan: Dict[str, List[str]] = {}
+        for (student_id, concept_id), when in sorted(expected.items(), key=lambda kv: (kv[1], kv[0])):
+            if when <= horizon:
+                scan.setdefault(student_id, []).append(concept_id)
+        assert batch == scan
+    assert len(scheduler) == len(expected)
+
+    # Extraction in time order, removes what it returns
+    popped = scheduler.pop_due(now, limit=50)
+    assert [when for _, _, when in popped] == sorted(w for w in expected.values() if w <= now)[:50]
+    rest = scheduler.pop_due(now)
+    assert all(when <= now for _, _, when in rest)
+    assert scheduler.due(now) == {}
+    assert len(scheduler) == sum(1 for when in expected.values() if when > now)
+
+    # Cancel and forget
+    student_id, concept_id = next(key for key, when in expected.items() if when > now)
+    scheduler.schedule(student_id, concept_id, None)
+    assert scheduler.next_review(student_id, concept_id) is None
+    left = sum(1 for (s, c), when in expected.items() if s == student_id and c != concept_id and when > now)
+    before = len(scheduler)
+    assert scheduler.forget_student(student_id) == left
+    assert len(scheduler) == before - left
+    assert student_id not in scheduler.due(now, within=timedelta(days=30))
+
+    print("✅ TEST PASSED: Review scheduler")
+
+
+def test_tracker_schedules_reviews():
+    """Test the tracker keeps the scheduler in step with SM-2"""
+    import pickle
+    from .knowledge_state import InteractionRecord, KnowledgeStateTracker, create_student_state
+
+    scheduler = ReviewScheduler()
+    tracker = KnowledgeStateTracker(review_scheduler=scheduler)
+    start = datetime(2026, 5, 4, 9, 0)
+
+    states = [create_student_state(f"STU_{s}") for s in range(5)]
+    for n in range(200):
+        state = states[n % 5]
+        tracker.update_state(state, InteractionRecord(
+            f"PHYS_{n % 7:03d}", f"Q_{n}", n % 4 != 0, start + timedelta(hours=n), 25.0, 0.5
+        ))
+
+    later = start + timedelta(days=12)
+    batch = scheduler.due(later)
+    for state in states:
+        assert sorted(batch.get(state.student_id, [])) == sorted(state.get_concepts_due_for_review(later))
+        for concept_id, concept_state in state.concept_states.items():
+            assert scheduler.next_review(state.student_id, concept_id) == concept_state.next_review
+
+    # States loaded from elsewhere are registered in one call
+    fresh = ReviewScheduler()
+    assert sum(fresh.track_state(state) for state in states) == len(scheduler)
+    assert fresh.due(later) == batch
+
+    copy = pickle.loads(pickle.dumps(scheduler))
+    assert copy.due(later) == batch
+    copy.schedule("STU_0", "PHYS_000", start)
+    assert copy.next_due() == start
+
+    print("✅ TEST PASSED: Tracker schedules reviews")
+
+
+# ============================================================================
+# RUN ALL TESTS
+# ============================================================================
+
+def run_all_tests() -> None:
+    """Run all Review Scheduler tests. Called by CI/CD pipeline."""
+    print("Running Review Scheduler tests...")
+    test_review_scheduler()
+    test_tracker_schedules_reviews()
+    print("✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("CR-V4 REVIEW SCHEDULER TESTS")
+    print("="*70 + "\n")
+
+    test_review_scheduler()
+    test_tracker_schedules_reviews()
+
+    print("\n" + "="*70)
+    print("ALL REVIEW SCHEDULER TESTS PASSED ✅")
+    print("="*70 + "\n")
@@ -0,0 +1,369 @@
+"""
+CR-V4 ASYNC ENGINE FACADE
+asyncio entry point for concurrent sessions
+
+Wraps a CognitiveResonanceEngine for ASGI servers:
+1. Requests for one student are serialized (per-student asyncio lock), so
+   concurrent answers can't race on student_states, session_states or
+   RecoveryEngine.active_plans
+2. Requests for different students run in parallel on a worker thread
+   pool, keeping CPU-heavy selection and state updates off the event loop
+3. Question bank changes go through the registry, which is itself
+   thread-safe
+
+Locks are created on demand and dropped as soon as no request for that
+student is in flight, so memory stays proportional to active requests,
+not to students seen.
+
+Each ASGI worker process owns its own facade; cross-process routing is
+handled by sharding students across workers, not by these locks.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .algorithms import (
+    StudentKnowledgeState,
+    Question,
+    ConceptNode,
+    IRTParameters
+)
+from .bank_snapshot import BankSnapshot
+from .engine_orchestrator import (
+    CognitiveResonanceEngine,
+    EngineResponse,
+    BatchAnswer,
+    StudentBatchDelta,
+    create_engine
+)
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_ENGINE_WORKERS = 8
+
+
+# ============================================================================
+# PER-STUDENT LOCKS
+# ============================================================================
+
+@dataclass
+class _LockEntry:
+    lock: asyncio.Lock
+    users: int = 0
+
+
+class StudentLocks:
+    """
+    Reference-counted asyncio locks keyed by student id.
+
+    Usage:
+        locks = StudentLocks()
+
+        async with locks.hold("STU_001"):
+            ...  # exclusive for STU_001, other students unaffected
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _LockEntry] = {}
+
+    @asynccontextmanager
+    async def hold(self, student_id: str) -> AsyncIterator[None]:
+        entry = self._entries.get(student_id)
+        if entry is None:
+            entry = self._entries[student_id] = _LockEntry(asyncio.Lock())
+        entry.users += 1
+
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del self._entries[student_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ============================================================================
+# ASYNC ENGINE
+# ============================================================================
+
+class AsyncCognitiveResonanceEngine:
+    """
+    asyncio facade over CognitiveResonanceEngine.
+
+    Usage:
+        engine = AsyncCognitiveResonanceEngine(create_engine(questions, concepts))
+
+        response = await engine.get_next_question("STU_001")
+        response = await engine.process_answer("STU_001", "Q_001", True, 45.0)
+
+        await engine.close()
+    """
+
+    def __init__(
+        self,
+        engine: Optional[CognitiveResonanceEngine] = None,
+        max_workers: int = DEFAULT_ENGINE_WORKERS
+    ):
+        self.engine = engine or create_engine()
+        self._locks = StudentLocks()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="cr-engine"
+        )
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking engine call on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _run_for_student(self, student_id: str, func, *args, **kwargs):
+        """Run a blocking engine call, serialized with the student's other requests"""
+        async with self._locks.hold(student_id):
+            return await self._run(func, student_id, *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Student API
+    # ------------------------------------------------------------------
+
+    async def initialize_student(
+        self,
+        student_id: str,
+        initial_state: Optional[StudentKnowledgeState] = None
+    ) -> StudentKnowledgeState:
+        """Initialize or load a student's knowledge state"""
+        return await self._run_for_student(
+            student_id, self.engine.initialize_student, initial_state
+        )
+
+    async def get_next_question(
+        self,
+        student_id: str,
+        subject: Optional[str] = None,
+        target_difficulty: Optional[str] = None
+    ) -> EngineResponse:
+        """Get the optimal next question for a student"""
+        return await self._run_for_student(
+            student_id, self.engine.get_next_question, subject, target_difficulty
+        )
+
+    async def process_answer(
+        self,
+        student_id: str,
+        question_id: str,
+        correct: bool,
+        time_taken: float,
+        student_answer: Optional[str] = None
+    ) -> EngineResponse:
+        """Process a student's answer and update all states"""
+        return await self._run_for_student(
+            student_id, self.engine.process_answer,
+            question_id, correct, time_taken, student_answer
+        )
+
+    async def process_answers_batch(
+        self,
+        answers: Iterable[Tuple]
+    ) -> Dict[str, StudentBatchDelta]:
+        """
+        Ingest a bulk upload of answers.
+
+        Holds the locks of every student in the batch (acquired in sorted
+        order, so overlapping batches can't deadlock).
+        """
+        answers = [BatchAnswer(*answer) for answer in answers]
+        student_ids = sorted({answer.student_id for answer in answers})
+
+        async with AsyncExitStack() as stack:
+            for student_id in student_ids:
+                await stack.enter_async_context(self._locks.hold(student_id))
+            return await self._run(self.engine.process_answers_batch, answers)
+
+    async def generate_test(
+        self,
+        student_id: str,
+        num_questions: int = 25,
+        subject: Optional[str] = None
+    ) -> List[Dict]:
+        """Generate a personalized test for a student"""
+        return await self._run_for_student(
+            student_id, self.engine.generate_test, num_questions, subject
+        )
+
+    async def get_study_plan(self, student_id: str) -> Dict:
+        """Generate a personalized study plan"""
+        return await self._run_for_student(student_id, self.engine.get_study_plan)
+
+    # ------------------------------------------------------------------
+    # Question bank API
+    # ------------------------------------------------------------------
+
+    async def add_questions(self, questions: List[Question]) -> None:
+        """Add (or replace) questions in the live bank"""
+        await self._run(self.engine.add_questions, questions)
+
+    async def retire_question(self, question_id: str) -> bool:
+        """Stop serving a question"""
+        return await self._run(self.engine.retire_question, question_id)
+
+    async def recalibrate_question(
+        self,
+        question_id: str,
+        irt_params: IRTParameters
+    ) -> bool:
+        """Swap in recalibrated IRT parameters for a question"""
+        return await self._run(
+            self.engine.recalibrate_question, question_id, irt_params
+        )
+
+    async def recalibrate_questions(
+        self,
+        parameters: Dict[str, IRTParameters]
+    ) -> int:
+        """Swap in a whole calibration run at once"""
+        return await self._run(self.engine.recalibrate_questions, parameters)
+
+    async def publish_item_calibration(self) -> int:
+        """Swap in pending online item estimates now"""
+        return await self._run(self.engine.publish_item_calibration)
+
+    async def reload_bank(
+        self,
+        questions: Optional[List[Question]] = None,
+        concepts: Optional[Dict[str, ConceptNode]] = None,
+        question_bank_path: Optional[str] = None
+    ) -> BankSnapshot:
+        """Hot reload the bank (built off the worker pool, swapped atomically)"""
+        return await asyncio.wrap_future(
+            self.engine.bank.reload(questions, concepts, question_bank_path)
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def close(self) -> None:
+        """Stop the worker pool and the engine's background workers"""
+        self._executor.shutdown(wait=True)
+        self.engine.shutdown()
+
+    async def __aenter__(self) -> "AsyncCognitiveResonanceEngine":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def create_async_engine(
+    questions: Optional[List[Question]] = None,
+    concepts: Optional[Dict[str, ConceptNode]] = None,
+    max_workers: int = DEFAULT_ENGINE_WORKERS,
+    **options
+) -> AsyncCognitiveResonanceEngine:
+    """
+    Factory function to create the async engine.
+
+    Extra keyword options are passed to CognitiveResonanceEngine.
+    """
+    return AsyncCognitiveResonanceEngine(
+        create_engine(questions, concepts, **options),
+        max_workers=max_workers
+    )
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+def _sample_questions() -> List[Question]:
+    return [
+        Question(f"Q{i}", f"MATH_{i % 5:03d}", "MATH", IRTParameters(b=i / 10 - 1))
+        for i in range(20)
+    ]
+
+
+def test_same_student_serialized():
+    """Test concurrent answers for one student are applied one at a time"""
+    async def scenario():
+        async with create_async_engine(_sample_questions()) as engine:
+            await engine.initialize_student("TEST_001")
+
+            answers = [
+                engine.process_answer("TEST_001", f"Q{i}", i % 2 == 0, 30.0)
+                for i in range(20)
+            ]
+            responses = await asyncio.gather(*answers)
+
+            assert all(r.success for r in responses)
+            state = engine.engine.student_states["TEST_001"]
+            session = engine.engine.session_states["TEST_001"]
+            assert state.total_interactions == 20, state.total_interactions
+            assert session.questions_attempted == 20
+            assert len(engine._locks) == 0, "Idle locks should be released"
+
+    asyncio.run(scenario())
+
+    print("✅ TEST PASSED: Same-student requests serialized")
+
+
+def test_students_run_in_parallel():
+    """Test one student's slow request doesn't block another student"""
+    async def scenario():
+        async with create_async_engine(_sample_questions(), max_workers=4) as engine:
+            order = []
+            blocker = asyncio.Event()
+
+            async def slow_request():
+                async with engine._locks.hold("TEST_SLOW"):
+                    await blocker.wait()
+                    order.append("slow")
+
+            async def fast_request():
+                response = await engine.get_next_question("TEST_FAST")
+                order.append("fast")
+                blocker.set()
+                return response
+
+            _, response = await asyncio.gather(slow_request(), fast_request())
+
+            assert response.success
+            assert order == ["fast", "slow"], order
+
+    asyncio.run(scenario())
+
+    print("✅ TEST PASSED: Different students run in parallel")
+
+
+# ============================================================================
+# RUN ALL TESTS
+# ============================================================================
+
+def run_all_tests() -> None:
+    """Run all Async Engine tests. Called by CI/CD pipeline."""
+    print("Running Async Engine tests...")
+    test_same_student_serialized()
+    test_students_run_in_parallel()
+    print("✅ All tests passed!")
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("CR-V4 ASYNC ENGINE TESTS")
+    print("="*70 + "\n")
+
+    test_same_student_serialized()
+    test_students_run_in_parallel()
+
+    print("\n" + "="*70)
+    print("ALL ASYNC ENGINE TESTS PASSED ✅")
+    print("="*70 + "\n")
@@ -0,0 +1,398 @@
+"""
+CR-V4 BANK SNAPSHOTS
+Hot reload of the question bank and concept graph
+
+The engine reads the bank through an immutable, versioned snapshot
+(registry + concept graph + eligibility bitmaps + selectors):
+1. Every request captures the current snapshot once and uses it to the
+   end, so a swap never changes the bank under an in-flight request
+2. Full reloads (new question list, compiled bank file or concept graph)
+   are built and warmed on a background thread, then swapped in with a
+   single reference assignment
+3. Small updates (add / retire / recalibrate a few questions) go through
+   QuestionRegistry.apply_delta: the new snapshot's columns are patched
+   from the old ones and eligibility bitmaps are kept, so there is no
+   rebuild, no latency spike and no cold cache
+4. Per-student selector caches that do not depend on the bank (Math
+   layer progress) are shared by every snapshot of a manager
+
+Concurrency:
+- Readers never lock (snapshot references are swapped atomically)
+- Writers (reloads and deltas) are serialized by one lock per manager
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Union
+
+from .algorithms import (
+    Question,
+    ConceptNode,
+    QuestionSelector,
+    MathSelector,
+    PhysicsSelector,
+    ChemistrySelector,
+    QuestionRegistry,
+    MappedQuestionRegistry,
+    PrerequisiteEligibility,
+    IRTParameters
+)
+
+
+Registry = Union[QuestionRegistry, MappedQuestionRegistry]
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+@dataclass(frozen=True)
+class BankSnapshot:
+    """
+    One immutable version of the bank as seen by the engine.
+
+    Capture it once per request (manager.current) and read everything
+    through it.
+    """
+    version: int
+    registry: Registry
+    concepts: Dict[str, ConceptNode]
+    eligibility: PrerequisiteEligibility
+    selectors: Dict[str, QuestionSelector]
+
+
+def build_snapshot(
+    version: int,
+    registry: Registry,
+    concepts: Dict[str, ConceptNode],
+    eligibility: Optional[PrerequisiteEligibility] = None,
+    response_table_error: Optional[float] = None,
+    previous: Optional[BankSnapshot] = None
+) -> BankSnapshot:
+    """
+    Wire selectors over a registry and warm its columnar index.
+
+    Pass the previous snapshot's eligibility when the concept graph is
+    unchanged to keep the per-student bitmaps. response_table_error
+    switches the selectors to tabulated Fisher information (the tables
+    are built here too). With previous, the Math selector shares its
+    layer progress cache.
+    """
+    if eligibility is None:
+        eligibility = PrerequisiteEligibility(concepts)
+
+    shared = {
+        'registry': registry,
+        'eligibility': eligibility,
+        'response_table_error': response_table_error
+    }
+    layer_progress = previous.selectors['MATH'].layer_progress if previous else None
+    selectors: Dict[str, QuestionSelector] = {
+        'MATH': MathSelector(None, concepts, layer_progress=layer_progress, **shared),
+        'PHYSICS': PhysicsSelector(None, concepts, **shared),
+        'CHEMISTRY': ChemistrySelector(None, concepts, **shared),
+        'ALL': QuestionSelector(None, concepts, **shared),
+    }
+
+    # Build the index now rather than on the first request after the swap
+    columns = registry.get_columns()
+    if response_table_error is not None:
+        columns.response_tables(response_table_error)
+
+    return BankSnapshot(
+        version=version,
+        registry=registry,
+        concepts=concepts,
+        eligibility=eligibility,
+        selectors=selectors
+    )
+
+
+# ============================================================================
+# MANAGER
+# ============================================================================
+
+class BankManager:
+    """
+    Owns the current bank snapshot and swaps in new versions.
+
+    Usage:
+        manager = BankManager(QuestionRegistry(questions), concepts)
+
+        bank = manager.current                       # per request
+        result = bank.selectors['ALL'].select_next_question(...)
+
+        manager.apply_delta(retired=["Q_002"])        # small update, sync
+        manager.reload(questions=new_bank).result()   # full rebuild, async
+    """
+
+    def __init__(
+        self,
+        registry: Registry,
+        concepts: Optional[Dict[str, ConceptNode]] = None,
+        on_swap: Optional[Callable[[BankSnapshot], None]] = None,
+        response_table_error: Optional[float] = None
+    ):
+        self.on_swap = on_swap
+        self.response_table_error = response_table_error
+        self._current = build_snapshot(
+            1, registry, concepts or {}, response_table_error=response_table_error
+        )
+
+        # Serializes writers; readers only dereference _current
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def current(self) -> BankSnapshot:
+        """Snapshot new requests should use"""
+        return self._current
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def apply_delta(
+        self,
+        added: Iterable[Question] = (),
+        recalibrated: Optional[Mapping[str, IRTParameters]] = None,
+        retired: Iterable[str] = ()
+    ) -> Set[str]:
+        """
+        Apply a small bank update and swap it in.
+
+        Returns:
+            Ids that changed (no swap happens if nothing did)
+
+        Raises:
+            ReadOnlyBankError: If the current bank is memory-mapped
+        """
+        with self._lock:
+            current = self._current
+            registry, changed = current.registry.apply_delta(
+                added=added, recalibrated=recalibrated, retired=retired
+            )
+            if changed:
+                self._swap(build_snapshot(
+                    current.version + 1, registry, current.concepts,
+                    current.eligibility, self.response_table_error, current
+                ))
+            return changed
+
+    def reload(
+        self,
+        questions: Optional[List[Question]] = None,
+        concepts: Optional[Dict[str, ConceptNode]] = None,
+        question_bank_path: Optional[str] = None
+    ) -> 'Future[BankSnapshot]':
+        """
+        Rebuild the bank in the background and swap it in when ready.
+
+        Args:
+            questions: New question list (replaces the bank)
+            concepts: New concept graph (None keeps the current one)
+            question_bank_path: Compiled bank file to map instead of questions
+
+        Returns:
+            Future resolving to the new snapshot; requests keep using the
+            old one until then
+        """
+        if questions is not None and question_bank_path is not None:
+            raise ValueError("Pass either questions or question_bank_path, not both")
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="cr-bank-reload"
+                )
+            return self._executor.submit(
+                self._reload, questions, concepts, question_bank_path
+            )
+
+    def shutdown(self) -> None:
+        """Finish pending reloads and stop the background worker"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _reload(
+        self,
+        questions: Optional[List[Question]],
+        concepts: Optional[Dict[str, ConceptNode]],
+        question_bank_path: Optional[str]
+    ) -> BankSnapshot:
+        # The expensive part (registry + columnar index) runs unlocked
+        registry: Optional[Registry] = None
+        if question_bank_path is not None:
+            registry = MappedQuestionRegistry(question_bank_path)
+        elif questions is not None:
+            registry = QuestionRegistry(questions)
+        if registry is not None:
+            columns = registry.get_columns()
+            if self.response_table_error is not None:
+                columns.response_tables(self.response_table_error)
+
+        with self._lock:
+            current = self._current
+            if concepts is None:
+                concepts, eligibility = current.concepts, current.eligibility
+            else:
+                eligibility = None
+            snapshot = build_snapshot(
+                current.version + 1,
+                registry if registry is not None else current.registry,
+                concepts,
+                eligibility,
+                self.response_table_error,
+                current
+            )
+            self._swap(snapshot)
+            return snapshot
+
+    def _swap(self, snapshot: BankSnapshot) -> None:
+        self._current = snapshot
+        if self.on_swap is not None:
+            self.on_swap(snapshot)
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+def _sample_bank(count: int = 20) -> List[Question]:
+    return [
+        Question(f"Q{i:03d}", f"MATH_{i % 4:03d}", "MATH",
+                 IRTParameters(b=-2.0 + 4.0 * i / count))
+        for i in range(count)
+    ]
+
+
+def test_delta_swap_keeps_old_snapshot():
+    """Test deltas swap in a new version while the old one stays usable"""
+    from .algorithms import create_student_state
+
+    swaps = []
+    manager = BankManager(QuestionRegistry(_sample_bank()), on_swap=swaps.append)
+    old = manager.current
+
+    changed = manager.apply_delta(
+        recalibrated={"Q001": IRTParameters(a=2.0, b=0.0)},
+        retired=["Q000"]
+    )
+    assert changed == {"Q000", "Q001"}, changed
+    assert manager.apply_delta(retired=["Q_missing"]) == set(), "No-op delta"
+
+    new = manager.current
+    assert new.version == old.version + 1 and swaps == [new]
+    assert new.eligibility is old.eligibility, "Bitmaps carried over"
+
+    # A request that captured the old snapshot still sees the old bank
+    assert old.registry.get("Q001").irt_params.a == 1.0
+    assert not old.registry.is_retired("Q000")
+    assert new.registry.get("Q001").irt_params.a == 2.0
+
+    state = create_student_state("TEST_BANK")
+    excluded = {f"Q{i:03d}" for i in range(1, 20)}
+    served_old = old.selectors['ALL'].select_next_question(state, excluded_questions=excluded)
+    served_new = new.selectors['ALL'].select_next_question(state, excluded_questions=excluded)
+    assert served_old.question.question_id == "Q000"
+    assert served_new.question.question_id != "Q000", "Retired in the new version"
+
+    # Math layer progress stays warm across versions
+    old.selectors['MATH'].get_current_layer(state)
+    assert "TEST_BANK" in new.selectors['MATH'].layer_progress
+
+    print("✅ TEST PASSED: Delta swap keeps old snapshot")
+
+
+def test_background_reload():
+    """Test full reloads build off-thread and keep the concept graph"""
+    concepts = {
+        "MATH_000": ConceptNode("MATH_000", "MATH", "Sets"),
+    }
+    manager = BankManager(QuestionRegistry(_sample_bank()), concepts)
+    old = manager.current
+
+    try:
+        snapshot = manager.reload(questions=_sample_bank(5)).result(timeout=10)
+        assert manager.current is snapshot
+        assert len(snapshot.registry) == 5 and len(old.registry) == 20
+        assert snapshot.concepts is concepts, "Concept graph kept when not given"
+        assert snapshot.registry.get_columns() is snapshot.registry.get_columns()
+
+        new_concepts = dict(concepts)
+        snapshot = manager.reload(concepts=new_concepts).result(timeout=10)
+        assert snapshot.concepts is new_concepts
+        assert snapshot.eligibility is not old.eligibility
+        assert len(snapshot.registry) == 5, "Bank kept when only concepts change"
+
+        try:
+            manager.reload(questions=[], question_bank_path="bank.crqb")
+            assert False, "Should reject conflicting sources"
+        except ValueError:
+            pass
+    finally:
+        manager.shutdown()
+
+    print("✅ TEST PASSED: Background reload")
+
+
+def test_response_tables_follow_deltas():
+    """Test tabulated selectors get warm, patched tables on every swap"""
+    import numpy as np
+    from .algorithms import fisher_information
+
+    manager = BankManager(QuestionRegistry(_sample_bank()), response_table_error=1e-3)
+    old = manager.current
+    assert old.selectors['ALL'].response_table_error == 1e-3
+    assert 1e-3 in old.registry.get_columns()._response_tables, "Warmed at build"
+
+    manager.apply_delta(
+        added=[Question("Q_NEW", "MATH_000", "MATH", IRTParameters(a=2.5, b=0.3, c=0.1))],
+        recalibrated={"Q001": IRTParameters(a=2.0, b=0.0)}
+    )
+    columns = manager.current.registry.get_columns()
+    tables = columns._response_tables[1e-3]
+    rows = columns.rows_for_ids(["Q001", "Q_NEW"])
+    assert np.allclose(
+        tables.information(0.4, rows),
+        fisher_information(0.4, columns.a[rows], columns.b[rows], columns.c[rows]),
+        atol=1e-3
+    )
+    assert old.registry.get_columns()._response_tables[1e-3] is not tables
+
+    print("✅ TEST PASSED: Response tables follow deltas")
+
+
+# ============================================================================
+# RUN ALL TESTS
+# ============================================================================
+
+def run_all_tests() -> None:
+    """Run all Bank Snapshot tests. Called by CI/CD pipeline."""
+    print("Running Bank Snapshot tests...")
+    test_delta_swap_keeps_old_snapshot()
+    test_background_reload()
+    test_response_tables_follow_deltas()
+    print("✅ All tests passed!")
+
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("CR-V4 BANK SNAPSHOT TESTS")
+    print("="*70 + "\n")
+
+    test_delta_swap_keeps_old_snapshot()
+    test_background_reload()
+    test_response_tables_follow_deltas()
+
+    print("\n" + "="*70)
+    print("ALL BANK SNAPSHOT TESTS PASSED ✅")
+    print("="*70 + "\n")
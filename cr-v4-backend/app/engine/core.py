@@ -9,6 +9,8 @@ from .engine_orchestrator import (
     CognitiveResonanceEngine,
     EngineResponse,
     SessionState,
+    BatchAnswer,
+    StudentBatchDelta,
     create_engine
 )
 
@@ -23,6 +25,7 @@ from .algorithms import (
     irt_probability,
     fisher_information,
     estimate_ability,
+    estimate_ability_batch,
     ability_to_mastery,
     
     # Knowledge State
@@ -47,6 +50,8 @@ __all__ = [
     'CognitiveResonanceEngine',
     'EngineResponse',
     'SessionState',
+    'BatchAnswer',
+    'StudentBatchDelta',
     'create_engine',
     
     # Algorithms
@@ -57,6 +62,7 @@ __all__ = [
     'irt_probability',
     'fisher_information',
     'estimate_ability',
+    'estimate_ability_batch',
     'ability_to_mastery',
     'StudentKnowledgeState',
     'KnowledgeStateTracker',
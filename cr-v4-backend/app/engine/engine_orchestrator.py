@@ -12,8 +12,10 @@ Single entry point for the frontend API.
 Handles the complete learning loop.
 """
 
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from collections.abc import Mapping
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
 # Import all algorithm components
@@ -25,15 +27,17 @@ from .algorithms import (
     KnowledgeStateTracker,
     create_student_state,
     process_interaction,
+    encode_state,
+    decode_state,
     
     # Question Selection
     Question,
     SelectionResult,
     ConceptNode,
     QuestionSelector,
-    MathSelector,
-    PhysicsSelector,
-    ChemistrySelector,
+    QuestionRegistry,
+    MappedQuestionRegistry,
+    PrerequisiteEligibility,
     SyllabusStatus,
     CompetencyType,
     
@@ -43,12 +47,30 @@ from .algorithms import (
     analyze_and_intervene,
     MisconceptionSeverity,
     
+    RecoveryPlan,
+    
     # IRT
     IRTParameters,
     irt_probability,
     fisher_information,
-    ability_to_mastery
+    ability_to_mastery,
+    OnlineItemCalibrator,
+    
+    # Log Replay / Review Scheduling
+    replay_log,
+    ReviewScheduler
+)
+from .state_store import (
+    StudentStateStore,
+    CachedStateStore,
+    DEFAULT_CACHE_CAPACITY
 )
+from .selection_prefetch import (
+    SelectionPrefetcher,
+    DEFAULT_ABILITY_DELTA,
+    DEFAULT_MASTERY_DELTA
+)
+from .bank_snapshot import BankManager, BankSnapshot
 
 
 # ============================================================================
@@ -107,6 +129,48 @@ class SessionState:
                 self.recent_concept_ids.pop(0)
 
 
+class LazySection(Mapping):
+    """
+    Response section built on first access, then memoized.
+    
+    Reads like the dict it wraps, so callers index it as before; sections
+    nobody reads (e.g. the summary of the inner next-question lookup in
+    process_answer) are never built. Built from live state: read or
+    serialize the response before the student's next interaction.
+    """
+    
+    __slots__ = ('_build', '_value')
+    
+    def __init__(self, build: Callable[[], Dict]):
+        self._build = build
+        self._value: Optional[Dict] = None
+    
+    def resolve(self) -> Dict:
+        if self._value is None:
+            self._value = self._build()
+            self._build = None
+        return self._value
+    
+    def __getitem__(self, key):
+        return self.resolve()[key]
+    
+    def __iter__(self) -> Iterator:
+        return iter(self.resolve())
+    
+    def __len__(self) -> int:
+        return len(self.resolve())
+    
+    def __repr__(self) -> str:
+        state = "built" if self._value is not None else "pending"
+        return f"LazySection({state})"
+
+
+def _resolve_section(section: Optional[Mapping]) -> Optional[Dict]:
+    if isinstance(section, LazySection):
+        return section.resolve()
+    return section
+
+
 @dataclass
 class EngineResponse:
     """
@@ -116,6 +180,9 @@ class EngineResponse:
     - Next question
     - Student state summary
     - Any interventions
+    
+    Summary, feedback and session sections may be LazySections; to_dict()
+    builds them.
     """
     success: bool
     
@@ -124,33 +191,94 @@ class EngineResponse:
     selection_reasons: List[str] = field(default_factory=list)
     
     # Student state summary
-    student_summary: Optional[Dict] = None
+    student_summary: Optional[Mapping] = None
     
     # Intervention (if misconception detected)
     intervention: Optional[Dict] = None
     
     # Feedback on previous question
-    previous_feedback: Optional[Dict] = None
+    previous_feedback: Optional[Mapping] = None
     
     # Performance metrics
-    session_stats: Optional[Dict] = None
+    session_stats: Optional[Mapping] = None
     
     # Error handling
     error: Optional[str] = None
     
+    def resolve(self) -> "EngineResponse":
+        """Build any lazy sections in place (e.g. before pickling)"""
+        self.student_summary = _resolve_section(self.student_summary)
+        self.previous_feedback = _resolve_section(self.previous_feedback)
+        self.session_stats = _resolve_section(self.session_stats)
+        return self
+    
     def to_dict(self) -> Dict:
         return {
             'success': self.success,
             'next_question': self.next_question,
             'selection_reasons': self.selection_reasons,
-            'student_summary': self.student_summary,
+            'student_summary': _resolve_section(self.student_summary),
             'intervention': self.intervention,
-            'previous_feedback': self.previous_feedback,
-            'session_stats': self.session_stats,
+            'previous_feedback': _resolve_section(self.previous_feedback),
+            'session_stats': _resolve_section(self.session_stats),
             'error': self.error
         }
 
 
+class BatchAnswer(NamedTuple):
+    """One answer in a bulk upload (OMR sheet, offline sync, exam backfill)"""
+    student_id: str
+    question_id: str
+    correct: bool
+    time_taken: float
+    timestamp: Optional[datetime] = None
+    student_answer: Optional[str] = None
+
+
+class StudentHandoff(NamedTuple):
+    """A student released by one engine for another to take over"""
+    state: bytes                        # encode_state payload
+    recovery_plans: List[RecoveryPlan]
+
+
+@dataclass
+class StudentBatchDelta:
+    """
+    What a bulk upload changed for one student.
+    
+    Before/after values bracket the whole batch, not single answers.
+    """
+    student_id: str
+    answers: int = 0
+    correct: int = 0
+    
+    ability_before: float = 0.0
+    ability_after: float = 0.0
+    overall_mastery_before: float = 0.5
+    overall_mastery_after: float = 0.5
+    
+    # concept_id -> (mastery before, mastery after)
+    concept_mastery: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    
+    # Misconception interventions raised along the way
+    interventions: List[Dict] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'student_id': self.student_id,
+            'answers': self.answers,
+            'correct': self.correct,
+            'ability_change': round(self.ability_after - self.ability_before, 3),
+            'ability': round(self.ability_after, 2),
+            'overall_mastery': f"{self.overall_mastery_after:.0%}",
+            'concepts': {
+                cid: {'before': f"{before:.0%}", 'after': f"{after:.0%}"}
+                for cid, (before, after) in self.concept_mastery.items()
+            },
+            'interventions': self.interventions
+        }
+
+
 # ============================================================================
 # ENGINE ORCHESTRATOR
 # ============================================================================
@@ -181,42 +309,230 @@ class CognitiveResonanceEngine:
     def __init__(
         self,
         questions: Optional[List[Question]] = None,
-        concepts: Optional[Dict[str, ConceptNode]] = None
+        concepts: Optional[Dict[str, ConceptNode]] = None,
+        prefetch_size: int = 0,
+        prefetch_ability_delta: float = DEFAULT_ABILITY_DELTA,
+        prefetch_mastery_delta: float = DEFAULT_MASTERY_DELTA,
+        state_store: Optional[StudentStateStore] = None,
+        state_cache_size: int = DEFAULT_CACHE_CAPACITY,
+        question_bank_path: Optional[str] = None,
+        item_calibrator: Optional[OnlineItemCalibrator] = None,
+        response_table_error: Optional[float] = None,
+        columnar_states: bool = False,
+        decay_on_read: bool = False,
+        irt_ability: bool = False,
+        review_scheduler: Optional[ReviewScheduler] = None
     ):
         """
         Initialize the engine with question bank and concept graph.
         
         In production, these would be loaded from database.
+        
+        Args:
+            questions: Initial question bank
+            concepts: Concept graph
+            prefetch_size: Questions to keep ranked ahead per student
+                           (0 disables prefetching)
+            prefetch_ability_delta: Ability drift that invalidates a queue
+            prefetch_mastery_delta: Per-concept mastery drift that
+                                    invalidates a queue
+            state_store: Durable backend for student states (None keeps
+                         them in a plain in-process dict)
+            state_cache_size: Hot states kept in memory in front of
+                              state_store
+            question_bank_path: Compiled bank file (compile_question_bank)
+                                to memory-map read-only instead of
+                                holding questions in memory (change it
+                                with reload_bank)
+            item_calibrator: Streaming IRT parameter updates from live
+                             answers, published to the bank every
+                             publish_every responses (ignored for a
+                             memory-mapped bank, which is read-only)
+            response_table_error: Score Fisher information from per-item
+                                  lookup tables within this absolute
+                                  error (high-QPS mode; None computes
+                                  it analytically)
+            columnar_states: Keep new and imported student states in
+                             typed columns (ColumnarKnowledgeState, a
+                             fraction of the memory per student). For
+                             state_store, pass a store built with
+                             StateCodecSerializer(columnar=True)
+            decay_on_read: Apply the forgetting curve when mastery is
+                           read (selection, tests, study plan, summaries),
+                           not only when a concept is practiced again;
+                           evaluated per day and memoized per student
+            irt_ability: Estimate ability with IRT (MAP, warm-started
+                         from the previous theta) once a student's recent
+                         window holds enough calibrated questions;
+                         otherwise difficulty-weighted accuracy
+            review_scheduler: Platform-wide queue of due spaced
+                              repetition reviews (see reviews_due), fed
+                              by every answer and by students loaded via
+                              initialize_student / import_students /
+                              rebuild_students (states already in a
+                              state_store: register with track_state)
         """
-        self.questions = questions or []
-        self.concepts = concepts or {}
+        # Question registry (O(1) lookup by id, shared by all selectors)
+        if question_bank_path is not None:
+            if questions:
+                raise ValueError("Pass either questions or question_bank_path, not both")
+            registry = MappedQuestionRegistry(question_bank_path)
+        else:
+            registry = QuestionRegistry(questions or [])
+        
+        # Versioned bank snapshots (registry, concept graph, prerequisite
+        # bitmaps, subject selectors), hot-swappable without a restart
+        self.bank = BankManager(
+            registry, concepts,
+            on_swap=self._on_bank_swap,
+            response_table_error=response_table_error
+        )
         
         # Initialize components
-        self.knowledge_tracker = KnowledgeStateTracker()
-        
-        # Subject-specific selectors
-        self.selectors: Dict[str, QuestionSelector] = {}
-        if self.questions:
-            self.selectors['MATH'] = MathSelector(
-                [q for q in self.questions if q.subject == 'MATH'],
-                self.concepts
-            )
-            self.selectors['PHYSICS'] = PhysicsSelector(
-                [q for q in self.questions if q.subject == 'PHYSICS'],
-                self.concepts
-            )
-            self.selectors['CHEMISTRY'] = ChemistrySelector(
-                [q for q in self.questions if q.subject == 'CHEMISTRY'],
-                self.concepts
-            )
-            self.selectors['ALL'] = QuestionSelector(self.questions, self.concepts)
+        self.knowledge_tracker = KnowledgeStateTracker(
+            item_parameters=self._item_parameters if irt_ability else None,
+            review_scheduler=review_scheduler
+        )
+        self.review_scheduler = review_scheduler
+        self.item_calibrator = item_calibrator
+        self.columnar_states = columnar_states
+        self.decay_on_read = decay_on_read
         
         self.misconception_detector = MisconceptionDetector()
         self.recovery_engine = RecoveryEngine(self.misconception_detector)
         
-        # State storage (in production, this would be Redis/database)
+        # State storage: LRU hot cache over a durable store, or a plain dict
         self.student_states: Dict[str, StudentKnowledgeState] = {}
+        if state_store is not None:
+            self.student_states = CachedStateStore(
+                state_store,
+                capacity=state_cache_size,
+                on_evict=self._forget_student
+            )
         self.session_states: Dict[str, SessionState] = {}
+        
+        # Optional background-ranked next-question queues
+        self.prefetcher: Optional[SelectionPrefetcher] = None
+        if prefetch_size > 0:
+            self.prefetcher = SelectionPrefetcher(
+                self.registry,
+                queue_size=prefetch_size,
+                ability_delta=prefetch_ability_delta,
+                mastery_delta=prefetch_mastery_delta
+            )
+    
+    @property
+    def registry(self) -> QuestionRegistry:
+        """Question registry of the current bank snapshot"""
+        return self.bank.current.registry
+    
+    @property
+    def concepts(self) -> Dict[str, ConceptNode]:
+        """Concept graph of the current bank snapshot"""
+        return self.bank.current.concepts
+    
+    @property
+    def eligibility(self) -> PrerequisiteEligibility:
+        """Prerequisite bitmaps of the current bank snapshot"""
+        return self.bank.current.eligibility
+    
+    @property
+    def selectors(self) -> Dict[str, QuestionSelector]:
+        """Subject selectors of the current bank snapshot"""
+        return self.bank.current.selectors
+    
+    @property
+    def questions(self) -> List[Question]:
+        """Active questions in the bank"""
+        return self.registry.all()
+    
+    def add_questions(self, questions: List[Question]) -> None:
+        """
+        Add (or replace) questions in the live bank.
+        
+        Swapped in as a patched snapshot, no engine rebuild needed;
+        requests already running finish on the previous version.
+        """
+        self.bank.apply_delta(added=questions)
+    
+    def retire_question(self, question_id: str) -> bool:
+        """Stop serving a question (answers to it are still processed)"""
+        return question_id in self.bank.apply_delta(retired=[question_id])
+    
+    def recalibrate_question(
+        self,
+        question_id: str,
+        irt_params: IRTParameters
+    ) -> bool:
+        """Swap in recalibrated IRT parameters for a question"""
+        changed = self.bank.apply_delta(recalibrated={question_id: irt_params})
+        if self.item_calibrator is not None:
+            self.item_calibrator.reset(changed)
+        return question_id in changed
+    
+    def recalibrate_questions(
+        self,
+        parameters: Mapping[str, IRTParameters]
+    ) -> int:
+        """
+        Swap in a whole calibration run (e.g. calibrate_bank) at once.
+        
+        Applied as a single bank delta, so selectors see either the old
+        or the new calibration, never a mix.
+        
+        Returns:
+            Number of questions updated
+        """
+        changed = self.bank.apply_delta(recalibrated=parameters)
+        if self.item_calibrator is not None:
+            # Online counts restart from the new calibration
+            self.item_calibrator.reset(changed)
+        return len(changed)
+    
+    def publish_item_calibration(self) -> int:
+        """
+        Swap in the item calibrator's pending online estimates now.
+        
+        Called automatically every publish_every answers; one bank delta
+        per publish, so the cost is independent of the answer rate.
+        
+        Returns:
+            Number of questions updated
+        """
+        if self.item_calibrator is None:
+            return 0
+        updates = self.item_calibrator.take_updates()
+        if not updates:
+            return 0
+        return len(self.bank.apply_delta(recalibrated=updates))
+    
+    def reload_bank(
+        self,
+        questions: Optional[List[Question]] = None,
+        concepts: Optional[Dict[str, ConceptNode]] = None,
+        question_bank_path: Optional[str] = None,
+        wait: bool = True
+    ) -> BankSnapshot:
+        """
+        Replace the question bank and/or concept graph without a restart.
+        
+        The new version is built and indexed on a background thread and
+        swapped in atomically; requests keep using the old version until
+        then (and in-flight ones finish on it).
+        
+        Args:
+            questions: New question list
+            concepts: New concept graph (None keeps the current one)
+            question_bank_path: Compiled bank file to map instead of questions
+            wait: Block until the new version is live
+            
+        Returns:
+            The new snapshot (the current one if wait is False)
+        """
+        future = self.bank.reload(questions, concepts, question_bank_path)
+        if wait:
+            return future.result()
+        return self.bank.current
     
     def initialize_student(
         self,
@@ -230,8 +546,12 @@ class CognitiveResonanceEngine:
         """
         if initial_state:
             self.student_states[student_id] = initial_state
+            if self.review_scheduler is not None:
+                self.review_scheduler.track_state(initial_state)
         elif student_id not in self.student_states:
-            self.student_states[student_id] = create_student_state(student_id)
+            self.student_states[student_id] = create_student_state(
+                student_id, columnar=self.columnar_states
+            )
         
         # Initialize session
         self.session_states[student_id] = SessionState(student_id=student_id)
@@ -257,12 +577,15 @@ class CognitiveResonanceEngine:
         Returns:
             EngineResponse with next question and context
         """
-        # Get student state
-        if student_id not in self.student_states:
-            self.initialize_student(student_id)
+        # Get states (a student known only from batch ingestion has a
+        # knowledge state but no session yet; initialize_student keeps it)
+        student_state = self.student_states.get(student_id)
+        session_state = self.session_states.get(student_id)
         
-        student_state = self.student_states[student_id]
-        session_state = self.session_states[student_id]
+        if student_state is None or session_state is None:
+            self.initialize_student(student_id)
+            student_state = self.student_states[student_id]
+            session_state = self.session_states[student_id]
         
         # Check for active misconception recovery
         priority_recovery = self.recovery_engine.get_priority_misconception(student_id)
@@ -271,11 +594,12 @@ class CognitiveResonanceEngine:
             # Force recovery flow
             return self._get_recovery_question(student_id, priority_recovery)
         
-        # Determine selector
-        selector_key = subject if subject in self.selectors else 'ALL'
-        selector = self.selectors.get(selector_key)
+        # Determine selector (one bank version for the whole request)
+        bank = self.bank.current
+        selector_key = subject if subject in bank.selectors else 'ALL'
+        selector = bank.selectors.get(selector_key)
         
-        if not selector:
+        if not selector or not len(bank.registry):
             return EngineResponse(
                 success=False,
                 error="No questions available"
@@ -284,13 +608,24 @@ class CognitiveResonanceEngine:
         # Get excluded questions (recently attempted)
         excluded = set(session_state.recent_question_ids)
         
+        # Serve from the prefetch queue if it is still valid
+        prefetch_key = (selector_key, subject, target_difficulty)
+        as_of = self._read_time()
+        result = None
+        if self.prefetcher:
+            result = self.prefetcher.take(
+                student_id, prefetch_key, student_state, excluded, as_of
+            )
+        
         # Select question
-        result = selector.select_next_question(
-            student_state,
-            subject=subject,
-            excluded_questions=excluded,
-            target_difficulty=target_difficulty
-        )
+        if result is None:
+            result = selector.select_next_question(
+                student_state,
+                subject=subject,
+                excluded_questions=excluded,
+                target_difficulty=target_difficulty,
+                as_of=as_of
+            )
         
         if not result.question:
             return EngineResponse(
@@ -298,13 +633,24 @@ class CognitiveResonanceEngine:
                 error="No suitable question found"
             )
         
+        # Rank the following questions off the critical path
+        if self.prefetcher:
+            excluded.add(result.question.question_id)
+            self.prefetcher.schedule_refill(
+                student_id, prefetch_key, selector, student_state, excluded, as_of
+            )
+        
         # Prepare response
         return EngineResponse(
             success=True,
             next_question=result.question.to_dict(),
             selection_reasons=result.reasons,
-            student_summary=self._get_student_summary(student_state),
-            session_stats=self._get_session_stats(session_state)
+            student_summary=LazySection(
+                lambda: self._get_student_summary(student_state)
+            ),
+            session_stats=LazySection(
+                lambda: self._get_session_stats(session_state)
+            )
         )
     
     def process_answer(
@@ -339,13 +685,14 @@ class CognitiveResonanceEngine:
             student_state = self.student_states[student_id]
             session_state = self.session_states[student_id]
         
-        # Find question details
-        question = next(
-            (q for q in self.questions if q.question_id == question_id),
-            None
-        )
+        # Find question details (O(1) registry lookup)
+        bank = self.bank.current
+        question = bank.registry.get(question_id)
         
-        if not question:
+        if question:
+            # Item calibration sees the ability from before this answer
+            self._observe_item(bank, question, correct, student_state)
+        else:
             # Unknown question - still process for state update
             question = Question(
                 question_id=question_id,
@@ -354,15 +701,20 @@ class CognitiveResonanceEngine:
             )
         
         # Step 1: Update knowledge state
-        student_state = process_interaction(
-            student_state,
-            concept_id=question.concept_id,
-            question_id=question_id,
-            correct=correct,
-            time_taken=time_taken,
-            difficulty=question.irt_params.b / 3 + 0.5,  # Normalize to 0-1
-            timestamp=datetime.now()
-        )
+        # (under the student's prefetch lock so background ranking never
+        # sees a half-applied interaction)
+        with self._state_lock(student_id):
+            student_state = self.knowledge_tracker.update_state(
+                student_state,
+                InteractionRecord(
+                    concept_id=question.concept_id,
+                    question_id=question_id,
+                    correct=correct,
+                    timestamp=datetime.now(),
+                    time_taken=time_taken,
+                    difficulty=question.irt_params.b / 3 + 0.5  # Normalize to 0-1
+                )
+            )
         self.student_states[student_id] = student_state
         
         # Step 2: Update session state
@@ -383,20 +735,24 @@ class CognitiveResonanceEngine:
             recovery_engine=self.recovery_engine
         )
         
-        # Step 4: Prepare feedback
-        feedback = self._generate_feedback(
+        # Step 4: Prepare feedback (built when the response is read)
+        feedback = LazySection(lambda: self._generate_feedback(
             correct=correct,
             question=question,
             time_taken=time_taken,
             student_state=student_state
-        )
+        ))
         
         # Step 5: Determine next steps
         response = EngineResponse(
             success=True,
             previous_feedback=feedback,
-            student_summary=self._get_student_summary(student_state),
-            session_stats=self._get_session_stats(session_state)
+            student_summary=LazySection(
+                lambda: self._get_student_summary(student_state)
+            ),
+            session_stats=LazySection(
+                lambda: self._get_session_stats(session_state)
+            )
         )
         
         # Check if intervention needed
@@ -422,6 +778,268 @@ class CognitiveResonanceEngine:
         
         return response
     
+    def process_answers_batch(
+        self,
+        answers: Iterable[Tuple]
+    ) -> Dict[str, StudentBatchDelta]:
+        """
+        Ingest a time-ordered stream of answers in bulk.
+        
+        For offline tests, OMR uploads and offline mobile sync. Each
+        student's answers are applied in the order given, with
+        misconception analysis, but no next question is selected and
+        session stats are left alone. Ability is re-estimated once per
+        student at the end (it only depends on the final interaction
+        buffer, so the result matches answer-by-answer processing), or
+        before every answer when an item calibrator needs it.
+        
+        Args:
+            answers: BatchAnswer records or plain tuples of
+                     (student_id, question_id, correct, time_taken,
+                     timestamp[, student_answer]); a None timestamp means now
+            
+        Returns:
+            StudentBatchDelta per student, in first-seen order
+        """
+        by_student: Dict[str, List[BatchAnswer]] = {}
+        for answer in answers:
+            answer = BatchAnswer(*answer)
+            by_student.setdefault(answer.student_id, []).append(answer)
+        
+        bank = self.bank.current
+        registry = bank.registry
+        questions: Dict[str, Question] = {}
+        deltas: Dict[str, StudentBatchDelta] = {}
+        
+        for student_id, student_answers in by_student.items():
+            student_state = self.student_states.get(student_id)
+            if student_state is None:
+                student_state = create_student_state(student_id, columnar=self.columnar_states)
+            
+            delta = StudentBatchDelta(
+                student_id=student_id,
+                ability_before=student_state.ability,
+                overall_mastery_before=student_state.get_overall_mastery()
+            )
+            
+            with self._state_lock(student_id):
+                for answer in student_answers:
+                    question = questions.get(answer.question_id)
+                    if question is None:
+                        question = registry.get(answer.question_id) or Question(
+                            question_id=answer.question_id,
+                            concept_id="UNKNOWN",
+                            subject="UNKNOWN"
+                        )
+                        questions[answer.question_id] = question
+                    
+                    if answer.question_id in registry and self.item_calibrator is not None:
+                        # Item calibration sees the ability from before this
+                        # answer, as in process_answer; otherwise ability is
+                        # only refreshed at the end of the batch
+                        self.knowledge_tracker.refresh_ability(student_state)
+                        self._observe_item(bank, question, answer.correct, student_state)
+                    
+                    concept_id = question.concept_id
+                    difficulty = question.irt_params.b / 3 + 0.5  # Normalize to 0-1
+                    if concept_id not in delta.concept_mastery:
+                        before = student_state.get_concept_mastery(concept_id)
+                        delta.concept_mastery[concept_id] = (before, before)
+                    
+                    self.knowledge_tracker.update_state(
+                        student_state,
+                        InteractionRecord(
+                            concept_id=concept_id,
+                            question_id=answer.question_id,
+                            correct=answer.correct,
+                            timestamp=answer.timestamp or datetime.now(),
+                            time_taken=answer.time_taken,
+                            difficulty=difficulty
+                        ),
+                        update_ability=False
+                    )
+                    
+                    analysis = analyze_and_intervene(
+                        student_id=student_id,
+                        concept_id=concept_id,
+                        correct=answer.correct,
+                        student_answer=answer.student_answer,
+                        time_taken=answer.time_taken,
+                        question_difficulty=difficulty,
+                        detector=self.misconception_detector,
+                        recovery_engine=self.recovery_engine
+                    )
+                    if analysis['intervention'].get('required', False):
+                        delta.interventions.append(analysis['intervention'])
+                    
+                    delta.answers += 1
+                    if answer.correct:
+                        delta.correct += 1
+                
+                self.knowledge_tracker.refresh_ability(student_state)
+            
+            self.student_states[student_id] = student_state
+            
+            for concept_id, (before, _) in delta.concept_mastery.items():
+                delta.concept_mastery[concept_id] = (
+                    before, student_state.get_concept_mastery(concept_id)
+                )
+            delta.ability_after = student_state.ability
+            delta.overall_mastery_after = student_state.get_overall_mastery()
+            deltas[student_id] = delta
+        
+        return deltas
+    
+    def resident_students(self) -> List[str]:
+        """Students whose state is currently held in memory"""
+        return list(self.student_states)
+    
+    def export_students(self, student_ids: Iterable[str]) -> Dict[str, StudentHandoff]:
+        """
+        Release students so another engine can take them over.
+        
+        Knowledge states travel as state codec payloads together with any
+        active misconception recovery plans; session state is dropped.
+        Students without a state are skipped.
+        """
+        handoffs: Dict[str, StudentHandoff] = {}
+        
+        for student_id in student_ids:
+            with self._state_lock(student_id):
+                student_state = self.student_states.get(student_id)
+                if student_state is None:
+                    continue
+                handoffs[student_id] = StudentHandoff(
+                    state=encode_state(student_state),
+                    recovery_plans=self.recovery_engine.active_plans.pop(student_id, [])
+                )
+            
+            if isinstance(self.student_states, CachedStateStore):
+                self.student_states.discard(student_id)
+            else:
+                self.student_states.pop(student_id, None)
+            self.session_states.pop(student_id, None)
+            self._forget_student(student_id)
+            if self.review_scheduler is not None:
+                self.review_scheduler.forget_student(student_id)
+        
+        return handoffs
+    
+    def import_students(self, handoffs: Dict[str, StudentHandoff]) -> int:
+        """Take over students released by export_students on another engine"""
+        for student_id, handoff in handoffs.items():
+            self.student_states[student_id] = decode_state(
+                handoff.state, columnar=self.columnar_states
+            )
+            if self.review_scheduler is not None:
+                self.review_scheduler.track_state(self.student_states[student_id])
+            if handoff.recovery_plans:
+                self.recovery_engine.active_plans[student_id] = list(handoff.recovery_plans)
+        return len(handoffs)
+    
+    def rebuild_students(self, log, workers: int = 1) -> int:
+        """
+        Rebuild student states from scratch by replaying an attempt log.
+        
+        The log (NumPy record array, Arrow table or mapping of columns;
+        see replay_log) replaces the state of every student in it. Concept
+        and difficulty come from the current bank unless the log has them.
+        
+        Returns:
+            Number of students rebuilt
+        """
+        # Reviews are scheduled once per rebuilt student, not per attempt
+        item_parameters = self.knowledge_tracker.item_parameters
+        if workers > 1 and item_parameters is not None:
+            # Worker processes get the calibrated items, not the engine
+            calibrated = {
+                question.question_id: question.irt_params
+                for question in self.registry
+                if question.irt_params.is_calibrated
+            }
+            item_parameters = calibrated.get
+        
+        states = replay_log(
+            log,
+            bank=self.registry,
+            workers=workers,
+            columnar=self.columnar_states,
+            tracker=KnowledgeStateTracker(item_parameters=item_parameters)
+        )
+        for student_id, student_state in states.items():
+            with self._state_lock(student_id):
+                self.student_states[student_id] = student_state
+            self._forget_student(student_id)
+            if self.review_scheduler is not None:
+                self.review_scheduler.track_state(student_state)
+        return len(states)
+    
+    def reviews_due(self, hours: float = 0.0) -> Dict[str, List[str]]:
+        """
+        Concepts due for spaced review now or within the next hours, by
+        student, across all students (e.g. to batch notifications).
+        
+        Empty without a review_scheduler.
+        """
+        if self.review_scheduler is None:
+            return {}
+        return self.review_scheduler.due(datetime.now(), within=timedelta(hours=hours))
+    
+    def flush_states(self) -> int:
+        """Persist dirty student states now (no-op without a state store)"""
+        if isinstance(self.student_states, CachedStateStore):
+            return self.student_states.flush()
+        return 0
+    
+    def shutdown(self) -> None:
+        """Stop background workers and persist student states"""
+        self.bank.shutdown()
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+        if isinstance(self.student_states, CachedStateStore):
+            self.student_states.close()
+    
+    def _on_bank_swap(self, snapshot: BankSnapshot) -> None:
+        """Point background ranking at a newly swapped-in bank version"""
+        prefetcher = getattr(self, 'prefetcher', None)
+        if prefetcher:
+            prefetcher.registry = snapshot.registry
+    
+    def _observe_item(
+        self,
+        bank: BankSnapshot,
+        question: Question,
+        correct: bool,
+        student_state: StudentKnowledgeState
+    ) -> None:
+        """Feed an answer to the online item calibrator (if enabled)"""
+        calibrator = self.item_calibrator
+        if calibrator is None or isinstance(bank.registry, MappedQuestionRegistry):
+            return
+        if calibrator.observe(question, correct, student_state.ability, student_state.ability_se):
+            self.publish_item_calibration()
+    
+    def _item_parameters(self, question_id: str) -> Optional[IRTParameters]:
+        """IRT parameters of a question in the current bank (ability estimation)"""
+        question = self.registry.get(question_id)
+        return question.irt_params if question else None
+    
+    def _forget_student(self, student_id: str) -> None:
+        """Drop per-student caches when a state leaves memory"""
+        # The session restarts lazily on the student's next request
+        self.session_states.pop(student_id, None)
+        self.eligibility.forget(student_id)
+        for selector in self.selectors.values():
+            selector.forget(student_id)
+        if self.prefetcher:
+            self.prefetcher.forget(student_id)
+    
+    def _state_lock(self, student_id: str):
+        """Lock guarding a student's state against background prefetch"""
+        if self.prefetcher:
+            return self.prefetcher.lock(student_id)
+        return nullcontext()
+    
     def _get_recovery_question(
         self,
         student_id: str,
@@ -477,13 +1095,17 @@ class CognitiveResonanceEngine:
             'concept_id': question.concept_id
         }
     
+    def _read_time(self) -> Optional[datetime]:
+        """as_of for mastery reads: now with decay_on_read, else None"""
+        return datetime.now() if self.decay_on_read else None
+    
     def _get_student_summary(self, student_state: StudentKnowledgeState) -> Dict:
         """Get summary of student's current state"""
         return {
             'student_id': student_state.student_id,
             'ability': round(student_state.ability, 2),
             'ability_percent': f"{ability_to_mastery(student_state.ability):.0%}",
-            'overall_mastery': f"{student_state.get_overall_mastery():.0%}",
+            'overall_mastery': f"{student_state.get_overall_mastery(self._read_time()):.0%}",
             'accuracy': f"{student_state.get_accuracy():.0%}",
             'total_interactions': student_state.total_interactions,
             'concepts_attempted': len(student_state.concept_states),
@@ -518,13 +1140,16 @@ class CognitiveResonanceEngine:
             self.initialize_student(student_id)
             student_state = self.student_states[student_id]
         
-        selector_key = subject if subject in self.selectors else 'ALL'
-        selector = self.selectors.get(selector_key)
+        bank = self.bank.current
+        selector_key = subject if subject in bank.selectors else 'ALL'
+        selector = bank.selectors.get(selector_key)
         
-        if not selector:
+        if not selector or not len(bank.registry):
             return []
         
-        batch = selector.select_batch(student_state, num_questions, subject)
+        batch = selector.select_batch(
+            student_state, num_questions, subject, as_of=self._read_time()
+        )
         
         return [result.to_dict() for result in batch]
     
@@ -543,19 +1168,21 @@ class CognitiveResonanceEngine:
             return {'error': 'Student not initialized'}
         
         # Get concepts due for review
-        due_for_review = student_state.get_concepts_due_for_review(datetime.now())
+        now = datetime.now()
+        due_for_review = student_state.get_concepts_due_for_review(now)
         
         # Get weak concepts (mastery < 60%)
-        weak_concepts = [
-            (cid, cs.get_combined_mastery())
-            for cid, cs in student_state.concept_states.items()
-            if cs.get_combined_mastery() < 0.6
-        ]
+        as_of = now if self.decay_on_read else None
+        mastery = {
+            cid: student_state.get_concept_mastery(cid, as_of)
+            for cid in student_state.concept_states
+        }
+        weak_concepts = [(cid, m) for cid, m in mastery.items() if m < 0.6]
         weak_concepts.sort(key=lambda x: x[1])
         
         return {
             'student_id': student_id,
-            'overall_mastery': f"{student_state.get_overall_mastery():.0%}",
+            'overall_mastery': f"{student_state.get_overall_mastery(as_of):.0%}",
             'priority_review': due_for_review[:5],
             'weak_areas': [
                 {'concept': cid, 'mastery': f"{m:.0%}"}
@@ -575,14 +1202,16 @@ class CognitiveResonanceEngine:
 
 def create_engine(
     questions: Optional[List[Question]] = None,
-    concepts: Optional[Dict[str, ConceptNode]] = None
+    concepts: Optional[Dict[str, ConceptNode]] = None,
+    **options
 ) -> CognitiveResonanceEngine:
     """
     Factory function to create the engine.
     
     In production, would load questions and concepts from database.
+    Extra keyword options (e.g. prefetch_size) are passed to the engine.
     """
-    return CognitiveResonanceEngine(questions, concepts)
+    return CognitiveResonanceEngine(questions, concepts, **options)
 
 
 # ============================================================================
@@ -654,10 +1283,503 @@ def test_process_answer():
     print("✅ TEST PASSED: Process answer")
 
 
+def test_live_question_bank():
+    """Test adding, retiring and recalibrating questions on a running engine"""
+    questions = [
+        Question("Q1", "PHYS_001", "PHYSICS", IRTParameters(b=0.0)),
+    ]
+    
+    engine = create_engine(questions=questions)
+    engine.initialize_student("TEST_004")
+    
+    # Added questions are served by the subject selectors without a rebuild
+    engine.add_questions([Question("Q2", "CHEM_001", "CHEMISTRY", IRTParameters(b=0.0))])
+    response = engine.get_next_question("TEST_004", subject="CHEMISTRY")
+    assert response.next_question['question_id'] == "Q2", "Should serve added question"
+    
+    # Recalibration is visible through the id index
+    engine.recalibrate_question("Q1", IRTParameters(a=2.0, b=1.0))
+    assert engine.registry.get("Q1").irt_params.a == 2.0
+    assert engine.recalibrate_questions({
+        "Q1": IRTParameters(a=1.5, b=0.5), "Q2": IRTParameters(a=1.2), "Q_missing": IRTParameters()
+    }) == 2
+    assert engine.registry.get("Q1").irt_params.a == 1.5
+    
+    # Retired questions are not served but answers still resolve
+    engine.retire_question("Q2")
+    response = engine.get_next_question("TEST_004", subject="CHEMISTRY")
+    assert response.next_question is None, "Retired question should not be served"
+    
+    response = engine.process_answer("TEST_004", "Q2", True, 30.0)
+    assert response.previous_feedback['concept_id'] == "CHEM_001"
+    
+    print("✅ TEST PASSED: Live question bank")
+
+
+def test_prefetch_queue():
+    """Test prefetched questions are served and dropped on drift"""
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 4:03d}", "MATH", IRTParameters(b=i / 10 - 0.5))
+        for i in range(12)
+    ]
+    
+    engine = create_engine(questions=questions, prefetch_size=4)
+    reference = create_engine(questions=questions)
+    engine.initialize_student("TEST_005")
+    reference.initialize_student("TEST_005")
+    
+    # First request is a miss; the following ones come from the queue
+    served = []
+    for _ in range(3):
+        response = engine.get_next_question("TEST_005")
+        served.append(response.next_question['question_id'])
+        engine.prefetcher.wait("TEST_005")
+    assert engine.prefetcher.stats.hits == 2, engine.prefetcher.stats.to_dict()
+    assert len(set(served)) == 3, "Queued questions are popped, not repeated"
+    
+    # Queue head is what synchronous selection would pick
+    expected = reference.selectors['ALL'].select_next_question(
+        reference.student_states["TEST_005"],
+        excluded_questions={served[0]}
+    )
+    assert served[1] == expected.question.question_id
+    
+    # Big ability change invalidates the queue
+    engine.prefetcher.wait("TEST_005")
+    engine.student_states["TEST_005"].ability += 1.0
+    engine.get_next_question("TEST_005")
+    assert engine.prefetcher.stats.stale == 1, engine.prefetcher.stats.to_dict()
+    
+    # Answering keeps working end to end with prefetch on
+    engine.prefetcher.wait("TEST_005")
+    response = engine.process_answer("TEST_005", served[0], True, 30.0)
+    assert response.success and response.next_question is not None
+    
+    # Forgotten mid-refill: ranking keeps the lock, its queue is dropped
+    import threading
+    started, release = threading.Event(), threading.Event()
+    
+    class SlowSelector:
+        def select_ranked(self, *args, **kwargs):
+            started.set()
+            release.wait(5.0)
+            return []
+    
+    prefetcher = engine.prefetcher
+    future = prefetcher.schedule_refill(
+        "TEST_006", ('ALL', None, None), SlowSelector(), engine.student_states["TEST_005"], set()
+    )
+    assert started.wait(5.0)
+    prefetcher.forget("TEST_006")
+    assert not prefetcher.lock("TEST_006").acquire(blocking=False), "Lock not swapped while ranking"
+    release.set()
+    future.result()
+    assert "TEST_006" not in prefetcher._queues and "TEST_006" not in prefetcher._locks
+    
+    engine.shutdown()
+    
+    print("✅ TEST PASSED: Prefetch queue")
+
+
+def test_persistent_state_store():
+    """Test student states survive an engine restart through the store"""
+    import os
+    import tempfile
+    from .state_store import SQLiteStateStore
+    
+    questions = [
+        Question("Q1", "MATH_001", "MATH", IRTParameters(b=0.0)),
+        Question("Q2", "MATH_002", "MATH", IRTParameters(b=0.5)),
+    ]
+    path = os.path.join(tempfile.mkdtemp(), "states.db")
+    
+    engine = create_engine(questions=questions, state_store=SQLiteStateStore(path), state_cache_size=2)
+    for i in range(4):
+        engine.process_answer(f"TEST_{i}", "Q1", True, 30.0)
+    assert len(engine.student_states) == 2, "Hot cache is bounded"
+    assert sorted(engine.session_states) == ["TEST_2", "TEST_3"], "Sessions leave with their state"
+    engine.shutdown()
+    
+    restarted = create_engine(questions=questions, state_store=SQLiteStateStore(path))
+    response = restarted.get_next_question("TEST_0")
+    assert response.success and response.next_question is not None
+    assert restarted.student_states["TEST_0"].total_interactions == 1
+    response = restarted.process_answer("TEST_3", "Q2", False, 50.0)
+    assert response.success
+    assert restarted.student_states["TEST_3"].total_interactions == 2
+    restarted.shutdown()
+    
+    print("✅ TEST PASSED: Persistent state store")
+
+
+def test_lazy_response_sections():
+    """Test summary sections are built only when read, and only once"""
+    questions = [
+        Question("Q1", "MATH_001", "MATH", IRTParameters(b=0.0)),
+        Question("Q2", "MATH_002", "MATH", IRTParameters(b=0.5)),
+    ]
+    
+    engine = create_engine(questions=questions)
+    built = []
+    build_summary = engine._get_student_summary
+    engine._get_student_summary = lambda state: built.append(state) or build_summary(state)
+    
+    response = engine.process_answer("TEST_004", "Q1", False, 45.0)
+    assert not built, "Summaries should not be built before they are read"
+    
+    payload = response.to_dict()
+    assert len(built) == 1, "Only the returned summary should be built"
+    assert payload['student_summary']['concepts_attempted'] == 1
+    assert payload['previous_feedback']['correct'] == False
+    assert payload['session_stats']['session_questions'] == 1
+    
+    assert response.student_summary['total_interactions'] == 1
+    assert len(built) == 1, "Built sections are memoized"
+    
+    print("✅ TEST PASSED: Lazy response sections")
+
+
+def test_process_answers_batch():
+    """Test bulk ingestion matches answer-by-answer state updates"""
+    from datetime import timedelta
+    
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 4:03d}", "MATH", IRTParameters(b=i / 5 - 1))
+        for i in range(10)
+    ]
+    start = datetime(2026, 1, 5, 9, 0)
+    answers = [
+        (f"TEST_{n % 3}", f"Q{n % 10}", n % 4 != 0, 40.0, start + timedelta(minutes=n))
+        for n in range(60)
+    ]
+    
+    engine = create_engine(questions=questions)
+    deltas = engine.process_answers_batch(answers)
+    
+    assert list(deltas) == ["TEST_0", "TEST_1", "TEST_2"]
+    assert sum(d.answers for d in deltas.values()) == 60
+    
+    # Reference: the same stream, one interaction at a time
+    for student_id, delta in deltas.items():
+        expected = create_student_state(student_id)
+        for sid, qid, correct, time_taken, timestamp in answers:
+            if sid == student_id:
+                q = engine.registry.get(qid)
+                expected = process_interaction(
+                    expected, q.concept_id, qid, correct, time_taken,
+                    q.irt_params.b / 3 + 0.5, timestamp
+                )
+        
+        state = engine.student_states[student_id]
+        assert state.total_interactions == expected.total_interactions == delta.answers
+        assert abs(state.ability - expected.ability) < 1e-12
+        assert abs(delta.ability_after - expected.ability) < 1e-12
+        for concept_id, (_, after) in delta.concept_mastery.items():
+            assert abs(after - expected.get_concept_mastery(concept_id)) < 1e-12
+    
+    assert deltas["TEST_0"].to_dict()['answers'] == 20
+    
+    # Students first seen in a batch can be served right away
+    state = engine.student_states["TEST_1"]
+    response = engine.get_next_question("TEST_1")
+    assert response.success and response.next_question is not None
+    assert engine.student_states["TEST_1"] is state, "Session start keeps the ingested state"
+    
+    print("✅ TEST PASSED: Bulk answer ingestion")
+
+
+def test_mapped_question_bank():
+    """Test the engine serves from a memory-mapped bank file"""
+    import os
+    import tempfile
+    from .algorithms import compile_question_bank, ReadOnlyBankError
+    
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 4:03d}", "MATH", IRTParameters(b=i / 5 - 1))
+        for i in range(10)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.crqb")
+        compile_question_bank(questions, path)
+        engine = create_engine(question_bank_path=path)
+        
+        response = engine.process_answer("TEST_005", "Q3", True, 30.0)
+        assert response.success and response.next_question is not None
+        assert response.previous_feedback['concept_id'] == "MATH_003"
+        assert len(engine.questions) == 10
+        
+        try:
+            engine.add_questions(questions[:1])
+            assert False, "Mapped bank should be read-only"
+        except ReadOnlyBankError:
+            pass
+    
+    print("✅ TEST PASSED: Mapped question bank")
+
+
+def test_hot_reload_bank():
+    """Test bank reloads swap versions without disturbing in-flight reads"""
+    import os
+    import tempfile
+    from .algorithms import compile_question_bank
+    
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 4:03d}", "MATH", IRTParameters(b=i / 5 - 1))
+        for i in range(10)
+    ]
+    engine = create_engine(questions=questions, prefetch_size=3)
+    engine.get_next_question("TEST_006")
+    in_flight = engine.bank.current
+    
+    # Small delta: patched snapshot, warm bitmaps kept
+    assert engine.retire_question("Q0")
+    assert not engine.retire_question("Q0")
+    assert engine.bank.current.eligibility is in_flight.eligibility
+    assert engine.prefetcher.registry is engine.registry
+    assert not in_flight.registry.is_retired("Q0")
+    
+    # Full reload onto a compiled bank file, then back to a question list
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.crqb")
+        compile_question_bank(questions[:5], path)
+        snapshot = engine.reload_bank(question_bank_path=path)
+        assert engine.bank.current is snapshot and len(engine.questions) == 5
+        assert engine.process_answer("TEST_006", "Q4", True, 20.0).success
+        
+        engine.reload_bank(questions=questions)
+        assert len(engine.questions) == 10
+    
+    # Requests holding the first version still resolve against it
+    assert in_flight.registry.get("Q9").question_id == "Q9"
+    assert engine.get_next_question("TEST_006").success
+    engine.shutdown()
+    
+    print("✅ TEST PASSED: Hot reload bank")
+
+
+def test_online_item_calibration():
+    """Test live answers recalibrate a new question through the bank"""
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 2:03d}", "MATH", IRTParameters(b=i / 5 - 1))
+        for i in range(10)
+    ]
+    engine = create_engine(
+        questions=questions,
+        item_calibrator=OnlineItemCalibrator(publish_every=20)
+    )
+    
+    # Everyone gets Q9 wrong: it should drift harder than its b=0.8 start
+    for s in range(40):
+        engine.process_answer(f"TEST_{s:03d}", "Q9", False, 30.0)
+    
+    params = engine.registry.get("Q9").irt_params
+    assert params.calibration_method == "online_em", params
+    assert params.b > 0.8 and params.sample_size == 40
+    
+    # Batch ingestion feeds the calibrator too
+    engine.process_answers_batch((f"TEST_{s:03d}", "Q1", True, 20.0, None) for s in range(20))
+    assert engine.registry.get("Q1").irt_params.sample_size == 20
+    
+    # Batch answers are calibrated against the ability before each one
+    batch, single = (
+        create_engine(questions=questions, item_calibrator=OnlineItemCalibrator(publish_every=1000))
+        for _ in range(2)
+    )
+    stream = [("TEST_SEQ", f"Q{n % 10}", n % 3 != 0, 30.0) for n in range(30)]
+    batch.process_answers_batch(answer + (None,) for answer in stream)
+    for answer in stream:
+        single.process_answer(*answer)
+    for question_id in {answer[1] for answer in stream}:
+        assert batch.item_calibrator.get(question_id) == single.item_calibrator.get(question_id)
+    
+    # A bulk run takes over and restarts the online counts
+    engine.recalibrate_question("Q9", IRTParameters(a=1.3, b=2.0, sample_size=900))
+    assert engine.item_calibrator.get("Q9") is None
+    assert engine.publish_item_calibration() == 0
+    
+    print("✅ TEST PASSED: Online item calibration")
+
+
 # ============================================================================
 # RUN TESTS
 # ============================================================================
 
+def test_columnar_states():
+    """Test columnar student states give the same results as object states"""
+    from datetime import timedelta
+    from .algorithms.columnar_state import ColumnarKnowledgeState
+    
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 4:03d}", "MATH", IRTParameters(b=(i % 5 - 2) * 0.5))
+        for i in range(12)
+    ]
+    start = datetime(2026, 1, 5, 9, 0)
+    answers = [
+        ("TEST_COL", f"Q{n % 12}", n % 3 != 1, 40.0, start + timedelta(hours=n))
+        for n in range(48)
+    ]
+    engines = [create_engine(questions=questions, columnar_states=columnar) for columnar in (False, True)]
+    for engine in engines:
+        engine.process_answers_batch(answers)
+    
+    objects, columnar = (engine.student_states["TEST_COL"] for engine in engines)
+    assert isinstance(columnar, ColumnarKnowledgeState), "New students are columnar"
+    assert dict(columnar.concept_states) == dict(objects.concept_states)
+    assert columnar.ability == objects.ability
+    assert engines[1].get_study_plan("TEST_COL") == engines[0].get_study_plan("TEST_COL")
+    
+    # Handoffs between engines land columnar too
+    handoffs = engines[0].export_students(["TEST_COL"])
+    engines[1].import_students(handoffs)
+    assert isinstance(engines[1].student_states["TEST_COL"], ColumnarKnowledgeState)
+    
+    print("✅ TEST PASSED: Columnar states")
+
+
+def test_decay_on_read():
+    """Test decay_on_read applies forgetting to reads between practice"""
+    from datetime import timedelta
+    
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 3:03d}", "MATH", IRTParameters(b=0.0))
+        for i in range(6)
+    ]
+    long_ago = datetime.now() - timedelta(days=90)
+    plans = []
+    for decay_on_read in (False, True):
+        engine = create_engine(questions=questions, decay_on_read=decay_on_read)
+        state = create_student_state("TEST_DECAY")
+        for i in range(30):
+            process_interaction(state, "MATH_000", f"Q{i}", True, 25.0, 0.5,
+                                long_ago + timedelta(minutes=i))
+        before = state.get_concept_mastery("MATH_000")
+        engine.initialize_student("TEST_DECAY", state)
+        plans.append(engine.get_study_plan("TEST_DECAY"))
+        assert engine.get_next_question("TEST_DECAY").success
+        assert state.get_concept_mastery("MATH_000") == before, "Reads never mutate"
+    
+    stored, decayed = (float(plan['overall_mastery'].rstrip('%')) for plan in plans)
+    assert 50 < decayed < stored, "Unpracticed mastery fades toward neutral on read"
+    
+    print("✅ TEST PASSED: Decay on read")
+
+
+def test_rebuild_students():
+    """Test rebuilding states from an attempt log matches live processing"""
+    import numpy as np
+    from datetime import timedelta
+    
+    questions = [
+        Question(f"Q{i}", f"PHYS_{i % 5:03d}", "PHYSICS", IRTParameters(b=(i % 7 - 3) * 0.4))
+        for i in range(20)
+    ]
+    start = datetime(2026, 3, 2, 10, 0)
+    answers = [
+        (f"TEST_RB{n % 3}", f"Q{(n * 7) % 20}", n % 4 != 2, 30.0 + n % 50, start + timedelta(hours=n))
+        for n in range(90)
+    ]
+    live = create_engine(questions=questions)
+    live.process_answers_batch(answers)
+    
+    log = {
+        name: np.array(column, dtype=object if name != 'timestamp' else 'datetime64[us]')
+        for name, column in zip(
+            ('student_id', 'question_id', 'correct', 'time_taken', 'timestamp'), zip(*answers)
+        )
+    }
+    rebuilt = create_engine(questions=questions)
+    assert rebuilt.rebuild_students(log) == 3
+    
+    for student_id in ("TEST_RB2", "TEST_RB1", "TEST_RB0"):
+        expected = live.student_states[student_id]
+        state = rebuilt.student_states[student_id]
+        assert dict(state.concept_states) == dict(expected.concept_states)
+        assert (state.ability, state.total_interactions) == (expected.ability, expected.total_interactions)
+    response = rebuilt.get_next_question("TEST_RB0")
+    assert response.success and response.next_question is not None
+    assert rebuilt.student_states["TEST_RB0"] is state, "Sessions start on the rebuilt state"
+    
+    print("✅ TEST PASSED: Rebuild students")
+
+
+def test_irt_ability():
+    """Test irt_ability switches to IRT once questions are calibrated"""
+    from .algorithms import estimate_ability
+    
+    def bank(calibrated: bool) -> List[Question]:
+        return [
+            Question(f"Q{i}", f"CHEM_{i % 3:03d}", "CHEMISTRY",
+                     IRTParameters(a=1.4, b=(i % 9 - 4) / 2, c=0.2, is_calibrated=calibrated))
+            for i in range(30)
+        ]
+    answers = [(f"Q{i}", i % 9 < 6) for i in range(30)]
+    
+    abilities = []
+    for calibrated, irt_ability in ((False, False), (False, True), (True, True)):
+        engine = create_engine(questions=bank(calibrated), irt_ability=irt_ability)
+        for question_id, correct in answers:
+            engine.process_answer("TEST_IRT", question_id, correct, 40.0)
+        abilities.append(engine.student_states["TEST_IRT"].ability)
+    
+    accuracy, uncalibrated, irt = abilities
+    assert uncalibrated == accuracy, "Uncalibrated items keep the accuracy estimate"
+    expected, _ = estimate_ability([c for _, c in answers], [q.irt_params for q in bank(True)])
+    assert abs(irt - expected) < 1e-4 and irt != accuracy
+    
+    print("✅ TEST PASSED: IRT ability estimation")
+
+
+def test_review_scheduler():
+    """Test engines keep a platform-wide review queue"""
+    import numpy as np
+    
+    questions = [
+        Question(f"Q{i}", f"MATH_{i % 6:03d}", "MATH", IRTParameters(b=0.0))
+        for i in range(12)
+    ]
+    start = datetime.now() - timedelta(days=20)
+    answers = [
+        (f"TEST_RS{n % 4}", f"Q{n % 12}", n % 5 != 0, 35.0, start + timedelta(hours=n))
+        for n in range(120)
+    ]
+    engines = [create_engine(questions=questions, review_scheduler=ReviewScheduler()) for _ in range(2)]
+    engines[0].process_answers_batch(answers)
+    
+    def scan(engine, hours: float = 0.0) -> Dict[str, List[str]]:
+        horizon = datetime.now() + timedelta(hours=hours)
+        due = {
+            student_id: sorted(state.get_concepts_due_for_review(horizon))
+            for student_id, state in engine.student_states.items()
+        }
+        return {student_id: concepts for student_id, concepts in due.items() if concepts}
+    
+    def queued(engine, hours: float = 0.0) -> Dict[str, List[str]]:
+        return {s: sorted(c) for s, c in engine.reviews_due(hours).items()}
+    
+    assert queued(engines[0]) == scan(engines[0]) != {}
+    assert queued(engines[0], 24 * 9) == scan(engines[0], 24 * 9)
+    
+    # Reviews follow students between engines
+    engines[1].import_students(engines[0].export_students(["TEST_RS1"]))
+    assert "TEST_RS1" not in engines[0].reviews_due(24 * 200)
+    assert queued(engines[1], 24 * 200) == scan(engines[1], 24 * 200)
+    
+    # ... and are registered for rebuilt students
+    log = {
+        name: np.array(column, dtype=object if name != 'timestamp' else 'datetime64[us]')
+        for name, column in zip(
+            ('student_id', 'question_id', 'correct', 'time_taken', 'timestamp'), zip(*answers)
+        )
+    }
+    rebuilt = create_engine(questions=questions, review_scheduler=ReviewScheduler())
+    rebuilt.rebuild_students(log)
+    assert queued(rebuilt, 24 * 9) == scan(rebuilt, 24 * 9)
+    assert create_engine(questions=questions).reviews_due(24) == {}
+    
+    print("✅ TEST PASSED: Review scheduler")
+
+
 if __name__ == "__main__":
     print("\n" + "="*70)
     print("CR-V4 ENGINE ORCHESTRATOR TESTS")
@@ -667,6 +1789,19 @@ if __name__ == "__main__":
     test_student_initialization()
     test_get_next_question()
     test_process_answer()
+    test_live_question_bank()
+    test_prefetch_queue()
+    test_persistent_state_store()
+    test_lazy_response_sections()
+    test_process_answers_batch()
+    test_mapped_question_bank()
+    test_hot_reload_bank()
+    test_online_item_calibration()
+    test_columnar_states()
+    test_decay_on_read()
+    test_rebuild_students()
+    test_irt_ability()
+    test_review_scheduler()
     
     print("\n" + "="*70)
     print("ALL ENGINE TESTS PASSED ✅")
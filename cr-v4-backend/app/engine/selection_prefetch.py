@@ -0,0 +1,358 @@
+"""
+CR-V4 SELECTION PREFETCH
+Per-student ranked queues of upcoming questions
+
+Takes question selection off the answer-submission critical path:
+1. After each question is served, the next K questions are ranked in the
+   background and queued for the student
+2. Each queue is tagged with the knowledge state it was ranked from
+   (mastery_version, ability and per-concept mastery)
+3. On the next request the head of the queue is served instantly, as
+   long as the student's state has not drifted past the configured
+   ability / mastery deltas
+4. A drifted queue is dropped and selection falls back to the normal
+   synchronous path, with a background refill scheduled
+
+Concurrency:
+- One worker pool per engine, refills are deduplicated per student
+- A per-student lock serializes state updates against background ranking,
+  so a refill never reads a half-applied interaction
+- Forgetting a student cancels its queued refill; one already ranking
+  keeps the student's lock until it finishes and discards its result
+"""
+
+import itertools
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from .algorithms import (
+    StudentKnowledgeState,
+    SelectionResult,
+    QuestionSelector,
+    QuestionRegistry
+)
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_PREFETCH_SIZE = 5
+DEFAULT_ABILITY_DELTA = 0.15    # theta units
+DEFAULT_MASTERY_DELTA = 0.10    # per concept, 0-1 scale
+DEFAULT_PREFETCH_WORKERS = 2
+
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class PrefetchQueue:
+    """
+    Ranked upcoming questions for one student.
+
+    Tagged with the knowledge state snapshot it was ranked from.
+    """
+    key: Tuple[str, Optional[str], Optional[str]]  # (selector, subject, difficulty)
+    entries: Deque[SelectionResult]
+
+    state_ref: weakref.ref
+    mastery_version: int
+    ability: float
+    mastery: Dict[str, float] = field(default_factory=dict)
+    as_of: Optional[datetime] = None    # Decay-aware ranking time (None: stored mastery)
+
+
+@dataclass
+class PrefetchStats:
+    """Counters for monitoring queue effectiveness"""
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    refills: int = 0
+
+    def to_dict(self) -> Dict:
+        served = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'refills': self.refills,
+            'hit_rate': f"{self.hits / served:.0%}" if served else "0%"
+        }
+
+
+def _day(as_of: Optional[datetime]):
+    return None if as_of is None else as_of.date()
+
+
+# ============================================================================
+# PREFETCHER
+# ============================================================================
+
+class SelectionPrefetcher:
+    """
+    Background-refilled selection queues, one per student.
+
+    Usage:
+        prefetcher = SelectionPrefetcher(registry, queue_size=5)
+
+        result = prefetcher.take(student_id, key, state, excluded)
+        if result is None:
+            result = selector.select_next_question(...)
+        prefetcher.schedule_refill(student_id, key, selector, state, ...)
+    """
+
+    def __init__(
+        self,
+        registry: QuestionRegistry,
+        queue_size: int = DEFAULT_PREFETCH_SIZE,
+        ability_delta: float = DEFAULT_ABILITY_DELTA,
+        mastery_delta: float = DEFAULT_MASTERY_DELTA,
+        max_workers: int = DEFAULT_PREFETCH_WORKERS
+    ):
+        self.registry = registry
+        self.queue_size = queue_size
+        self.ability_delta = ability_delta
+        self.mastery_delta = mastery_delta
+
+        self._queues: Dict[str, PrefetchQueue] = {}
+        self._pending: Dict[str, Tuple[int, Future]] = {}   # (ticket, refill)
+        self._tickets = itertools.count()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="cr-prefetch"
+        )
+
+        self.stats = PrefetchStats()
+
+    # ------------------------------------------------------------------
+    # Locking
+    # ------------------------------------------------------------------
+
+    def lock(self, student_id: str) -> threading.Lock:
+        """
+        Per-student lock.
+
+        Hold it while mutating the student's knowledge state; background
+        refills take it while ranking.
+        """
+        with self._guard:
+            student_lock = self._locks.get(student_id)
+            if student_lock is None:
+                student_lock = self._locks[student_id] = threading.Lock()
+            return student_lock
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def take(
+        self,
+        student_id: str,
+        key: Tuple[str, Optional[str], Optional[str]],
+        student_state: StudentKnowledgeState,
+        excluded: Set[str],
+        as_of: Optional[datetime] = None
+    ) -> Optional[SelectionResult]:
+        """
+        Pop the next valid queued question.
+
+        Returns None on a miss (no queue, different selector/subject/
+        difficulty, state drifted past the deltas, or queue exhausted).
+        With as_of (decay-aware selection), a queue ranked on another day
+        is stale.
+        """
+        with self.lock(student_id):
+            queue = self._queues.get(student_id)
+
+            if queue is None or queue.key != key:
+                self.stats.misses += 1
+                return None
+
+            if self._has_drifted(queue, student_state, as_of):
+                del self._queues[student_id]
+                self.stats.stale += 1
+                self.stats.misses += 1
+                return None
+
+            while queue.entries:
+                result = queue.entries.popleft()
+                question_id = result.question.question_id
+                if question_id in excluded or self.registry.is_retired(question_id):
+                    continue
+                # Queued under an older bank version: serve the current copy
+                question = self.registry.get(question_id)
+                if question is None:
+                    continue
+                if question is not result.question:
+                    result = replace(result, question=question)
+                self.stats.hits += 1
+                return result
+
+            del self._queues[student_id]
+            self.stats.misses += 1
+            return None
+
+    def _has_drifted(
+        self,
+        queue: PrefetchQueue,
+        student_state: StudentKnowledgeState,
+        as_of: Optional[datetime] = None
+    ) -> bool:
+        """Whether the state moved past the deltas since the queue was ranked"""
+        if queue.state_ref() is not student_state:
+            return True
+
+        # Decayed mastery is evaluated per day
+        if _day(queue.as_of) != _day(as_of):
+            return True
+
+        if abs(student_state.ability - queue.ability) > self.ability_delta:
+            return True
+
+        changed = student_state.changed_concepts_since(queue.mastery_version)
+        if changed is None:
+            return True  # Journal overflowed, can't tell
+
+        for concept_id in changed:
+            then = queue.mastery.get(concept_id, 0.5)
+            if abs(student_state.get_concept_mastery(concept_id, queue.as_of) - then) > self.mastery_delta:
+                return True
+
+        return False
+
+    # ------------------------------------------------------------------
+    # Refill
+    # ------------------------------------------------------------------
+
+    def schedule_refill(
+        self,
+        student_id: str,
+        key: Tuple[str, Optional[str], Optional[str]],
+        selector: QuestionSelector,
+        student_state: StudentKnowledgeState,
+        excluded: Set[str],
+        as_of: Optional[datetime] = None
+    ) -> Optional[Future]:
+        """
+        Re-rank the student's queue in the background.
+
+        Skipped while a refill for the student is already pending, or
+        while the current queue is valid and at least half full.
+        """
+        with self._guard:
+            pending = self._pending.get(student_id)
+            if pending is not None and not pending[1].done():
+                return None
+
+            queue = self._queues.get(student_id)
+            if (
+                queue is not None and
+                queue.key == key and
+                len(queue.entries) * 2 >= self.queue_size and
+                not self._has_drifted(queue, student_state, as_of)
+            ):
+                return None
+
+            ticket = next(self._tickets)
+            future = self._executor.submit(
+                self._refill, ticket, student_id, key, selector, student_state, set(excluded), as_of
+            )
+            self._pending[student_id] = (ticket, future)
+            return future
+
+    def _refill(
+        self,
+        ticket: int,
+        student_id: str,
+        key: Tuple[str, Optional[str], Optional[str]],
+        selector: QuestionSelector,
+        student_state: StudentKnowledgeState,
+        excluded: Set[str],
+        as_of: Optional[datetime] = None
+    ) -> None:
+        _, subject, target_difficulty = key
+
+        student_lock = self.lock(student_id)
+        with student_lock:
+            ranked = selector.select_ranked(
+                student_state,
+                self.queue_size,
+                subject=subject,
+                excluded_questions=excluded,
+                target_difficulty=target_difficulty,
+                as_of=as_of
+            )
+
+            queue = PrefetchQueue(
+                key=key,
+                entries=deque(ranked),
+                state_ref=weakref.ref(student_state),
+                mastery_version=student_state.mastery_version,
+                ability=student_state.ability,
+                mastery={
+                    concept_id: student_state.get_concept_mastery(concept_id, as_of)
+                    for concept_id in student_state.concept_states
+                },
+                as_of=as_of
+            )
+
+            with self._guard:
+                pending = self._pending.get(student_id)
+                forgotten = pending is None or pending[0] != ticket
+                if not forgotten:
+                    self._queues[student_id] = queue
+                    self.stats.refills += 1
+
+        if forgotten:
+            # Student forgotten while ranking: forget() left the lock to us
+            with self._guard:
+                if (
+                    student_id not in self._pending and
+                    self._locks.get(student_id) is student_lock and
+                    not student_lock.locked()
+                ):
+                    del self._locks[student_id]
+
+    def wait(self, student_id: str, timeout: Optional[float] = None) -> None:
+        """Block until the student's pending refill (if any) has finished"""
+        pending = self._pending.get(student_id)
+        if pending is not None:
+            pending[1].result(timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def invalidate(self, student_id: str) -> None:
+        """Drop a student's queue"""
+        with self.lock(student_id):
+            self._queues.pop(student_id, None)
+
+    def forget(self, student_id: str) -> None:
+        """
+        Drop every trace of a student (e.g. on logout or eviction).
+
+        A queued refill is cancelled. One already ranking is not waited
+        for (the caller may hold locks it needs): it keeps the student's
+        lock, discards its queue and drops the lock when done.
+        """
+        with self._guard:
+            self._queues.pop(student_id, None)
+            pending = self._pending.pop(student_id, None)
+            if pending is None or pending[1].cancel() or pending[1].done():
+                self._locks.pop(student_id, None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the background workers"""
+        self._executor.shutdown(wait=wait)